@@ -1,51 +1,23 @@
-from flask import Flask, render_template, request, send_file
-import pandas as pd
-from pulp import *
+from flask import Flask, render_template, request, send_file, Response, stream_with_context, jsonify
 import os
-from ebook import generate_latex, openai
-import subprocess
+from ebook import generate_latex, generate_ebook
 import youtube
 import zipfile
+from optimizer import solve_menu, solve_batch, plan_week, approximate_menu, sweep_targets, target_range, MenuInfeasibleError
+from optimizer.sweep import to_csv as sweep_to_csv
+from optimizer import plan_procurement, get_catalog, add_dish, update_dish, retire_dish, DATA_PATH
 from io import BytesIO
-import openai
+import json
+import checkpoint
 
 app = Flask(__name__)
-# ===== 기본 데이터 =====
-# 데이터 파일 경로
-DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "menu_data.csv")
-# 데이터 읽기 함수
-def load_data():
-    return pd.read_csv(DATA_PATH)
-
-def optimize_menu(cal_target, protein_target, budget_limit):
-    df = load_data()  # 매번 최신 데이터 읽기
-    prob = LpProblem("MilitaryMealPlan", LpMinimize)
-    menu_vars = LpVariable.dicts("servings", df["name"], lowBound=0, cat="Integer")
-
-    # 비용 최소화
-    prob += lpSum([menu_vars[i] * df.loc[df["name"] == i, "cost"].values[0] for i in df["name"]])
-
-    # 제약조건
-    prob += lpSum([menu_vars[i] * df.loc[df["name"] == i, "cal"].values[0] for i in df["name"]]) >= cal_target
-    prob += lpSum([menu_vars[i] * df.loc[df["name"] == i, "protein"].values[0] for i in df["name"]]) >= protein_target
-    prob += lpSum([menu_vars[i] * df.loc[df["name"] == i, "cost"].values[0] for i in df["name"]]) <= budget_limit
-
-    prob.solve(PULP_CBC_CMD(msg=0))
-
-    result = []
-    total_cost, total_cal, total_protein = 0, 0, 0
-    for i in df["name"]:
-        qty = menu_vars[i].varValue
-        if qty > 0:
-            cost = qty * df.loc[df["name"] == i, "cost"].values[0]
-            cal = qty * df.loc[df["name"] == i, "cal"].values[0]
-            protein = qty * df.loc[df["name"] == i, "protein"].values[0]
-            total_cost += cost
-            total_cal += cal
-            total_protein += protein
-            result.append({"menu": i, "qty": int(qty), "cost": cost, "cal": cal, "protein": protein})
-
-    return result, total_cost, total_cal, total_protein
+# 식단 최적화 시간 제한(초): 어려운 문제가 워커를 무한정 붙잡지 않도록
+MENU_TIME_LIMIT = float(os.environ.get("MENU_TIME_LIMIT", 10))
+# 민감도 분석(/sweep) 한 번에 허용하는 최대 격자점 수
+MAX_SWEEP_POINTS = 2500
+# N일 식단 계획(/plan) 최대 일수와 최대 시간 제한(초)
+MAX_PLAN_DAYS = 31
+MAX_PLAN_TIME_LIMIT = float(os.environ.get("MAX_PLAN_TIME_LIMIT", 60))
 
 @app.route("/", methods=["GET", "POST"])
 def index():
@@ -53,11 +25,142 @@ def index():
         cal_target = int(request.form["cal"])
         protein_target = int(request.form["protein"])
         budget_limit = float(request.form["budget"])
-        result, total_cost, total_cal, total_protein = optimize_menu(cal_target, protein_target, budget_limit)
-        return render_template("index.html", result=result, total_cost=total_cost,
-                               total_cal=total_cal, total_protein=total_protein)
+        # 시간 제한 안의 최선해와 솔버 상태/gap을 함께 표시
+        out = solve_menu(cal_target, protein_target, budget_limit, time_limit=MENU_TIME_LIMIT)
+        if "result" not in out:
+            return render_template("index.html", result=None, error=f"⚠ {MenuInfeasibleError(out['status'])}",
+                                   status=out["status"])
+        return render_template("index.html", result=out["result"], total_cost=out["total_cost"],
+                               total_cal=out["total_cal"], total_protein=out["total_protein"],
+                               status=out["status"], gap=out["gap"])
     return render_template("index.html", result=None)
 
+@app.route("/approx", methods=["GET"])
+def approx():
+    # UI 슬라이더용 근사 모드: /approx?cal=2800&protein=70&budget=10400
+    try:
+        cal_target = float(request.args["cal"])
+        protein_target = float(request.args["protein"])
+        budget_limit = float(request.args["budget"])
+    except (KeyError, ValueError) as e:
+        return jsonify(error=f"잘못된 요청: {e}"), 400
+    return jsonify(approximate_menu(cal_target, protein_target, budget_limit))
+
+@app.route("/sweep", methods=["POST"])
+def sweep():
+    # 요청 예: {"cal": {"start": 2000, "stop": 3200, "step": 100}, "protein": [50, 70, 90],
+    #          "budget": 12000, "format": "csv"}
+    payload = request.get_json(silent=True) or {}
+    try:
+        cal_values = target_range(payload["cal"], MAX_SWEEP_POINTS)
+        protein_values = target_range(payload["protein"], MAX_SWEEP_POINTS)
+        budget_limit = payload.get("budget")
+        budget_limit = None if budget_limit is None else float(budget_limit)
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify(error=f"잘못된 요청: {e}"), 400
+    if len(cal_values) * len(protein_values) > MAX_SWEEP_POINTS:
+        return jsonify(error=f"격자점은 최대 {MAX_SWEEP_POINTS}개까지 가능합니다."), 400
+
+    rows = sweep_targets(cal_values, protein_values, budget_limit, time_limit=MENU_TIME_LIMIT,
+                         include_plans=bool(payload.get("include_plans")))
+    if payload.get("format") == "csv":
+        return Response(sweep_to_csv(rows), mimetype="text/csv",
+                        headers={"Content-Disposition": "attachment; filename=sweep.csv"})
+    return jsonify(rows)
+
+@app.route("/batch", methods=["POST"])
+def batch():
+    # 요청 형식: [{"cal":..,"protein":..,"budget":..}, ...]
+    #           또는 {"scenarios": [...], "backend": "highs", "time_limit": 5, "mip_gap": 0.01}
+    payload = request.get_json(silent=True)
+    options = {"time_limit": MENU_TIME_LIMIT}
+    if isinstance(payload, dict):
+        scenarios = payload.get("scenarios")
+        options.update({k: payload[k] for k in ("backend", "time_limit", "mip_gap") if k in payload})
+    else:
+        scenarios = payload
+    if not isinstance(scenarios, list):
+        return jsonify(error="시나리오 목록(JSON 배열)이 필요합니다."), 400
+
+    def generate():
+        for row in solve_batch(scenarios, **options):
+            yield json.dumps(row, ensure_ascii=False) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+@app.route("/plan", methods=["POST"])
+def plan():
+    # 요청 예: {"cal": 2800, "protein": 70, "days": 7, "budget": 80000, "max_repeats": 3, "min_distinct": 6}
+    payload = request.get_json(silent=True) or {}
+    try:
+        days = int(payload.get("days", 7))
+        time_limit = float(payload.get("time_limit", 30))
+        if not 1 <= days <= MAX_PLAN_DAYS:
+            raise ValueError(f"days는 1~{MAX_PLAN_DAYS} 사이여야 합니다.")
+        if not time_limit > 0:
+            raise ValueError("time_limit은 0보다 커야 합니다.")
+        result = plan_week(
+            cal_min=float(payload["cal"]),
+            protein_min=float(payload["protein"]),
+            days=days,
+            budget=payload.get("budget"),
+            daily_budget=payload.get("daily_budget"),
+            max_repeats=payload.get("max_repeats"),
+            min_distinct=payload.get("min_distinct"),
+            max_servings=payload.get("max_servings"),
+            time_limit=min(time_limit, MAX_PLAN_TIME_LIMIT),
+            mip_gap=payload.get("mip_gap"),
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify(error=f"잘못된 요청: {e}"), 400
+    return jsonify(result)
+
+@app.route("/procurement", methods=["POST"])
+def procurement():
+    # 요청 예: {"units": [{"name": "1대대", "headcount": 500, "cal": 2800, "protein": 70, "budget": 10400}],
+    #          "supply_caps": {"쌀밥": 5000}, "tiers": [[0, 1.0], [1000, 0.95]], "time_limit": 60}
+    payload = request.get_json(silent=True) or {}
+    try:
+        result = plan_procurement(
+            payload["units"],
+            supply_caps=payload.get("supply_caps"),
+            tiers=payload.get("tiers") or [(0, 1.0)],
+            time_limit=float(payload.get("time_limit", 60)),
+            mip_gap=payload.get("mip_gap"),
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify(error=f"잘못된 요청: {e!r}"), 400
+    return jsonify(result)
+
+@app.route("/catalog", methods=["GET", "POST"])
+def catalog():
+    # GET: 현재 스냅샷 / POST {"name", "cost", "cal", "protein"}: 메뉴 추가
+    if request.method == "POST":
+        payload = request.get_json(silent=True) or {}
+        try:
+            snapshot = add_dish(payload["name"], payload["cost"], payload["cal"], payload["protein"], path=DATA_PATH)
+        except (KeyError, TypeError, ValueError) as e:
+            return jsonify(error=f"잘못된 요청: {e!r}"), 400
+        return jsonify(version=snapshot.version, revision=snapshot.revision, items=len(snapshot)), 201
+
+    snapshot = get_catalog(DATA_PATH)
+    return jsonify(version=snapshot.version, revision=snapshot.revision,
+                   items=snapshot.to_frame().to_dict(orient="records"))
+
+@app.route("/catalog/<name>", methods=["PUT", "DELETE"])
+def catalog_item(name):
+    # PUT {"cost": .., "cal": .., "protein": ..}: 수정 / DELETE: 폐지
+    try:
+        if request.method == "DELETE":
+            snapshot = retire_dish(name, path=DATA_PATH)
+        else:
+            snapshot = update_dish(name, path=DATA_PATH, **(request.get_json(silent=True) or {}))
+    except KeyError:
+        return jsonify(error=f"없는 메뉴입니다: {name}"), 404
+    except (TypeError, ValueError) as e:
+        return jsonify(error=f"잘못된 요청: {e}"), 400
+    return jsonify(version=snapshot.version, revision=snapshot.revision, items=len(snapshot))
+
 @app.route("/index0", methods=["GET", "POST"])
 def index0():
     return render_template("index0.html")
@@ -78,9 +181,11 @@ def index2():
         except ValueError:
             return render_template("index2.html", error="⚠ 하위 주제 개수는 정수여야 합니다.")
 
-        openai.api_key = apikey  # 사용자 입력 API 키 세팅
+        # EPUB/HTML은 LaTeX 컴파일 없이 바로 생성
+        if filetype in ("epub", "html"):
+            return send_file(generate_ebook(topic, num_list, filetype, api_key=apikey), as_attachment=True)
 
-        tex_path, pdf_path = generate_latex(topic, num_list)
+        tex_path, pdf_path = generate_latex(topic, num_list, api_key=apikey)
 
         if filetype == "pdf":
             if os.path.exists(pdf_path):
@@ -98,16 +203,23 @@ def index3():
 
 @app.route("/generate", methods=["POST"])
 def generate():
-    api_key = request.form["api_key"]
+    api_key = request.form.get("api_key", "").strip()
+    if not api_key:
+        return "<h2>에러 발생</h2><pre>API 키를 입력하세요.</pre>", 400
     topic = request.form["topic"]
     num_images = int(request.form["num_images"])
+    # 실패 시 같은 재개 ID로 다시 제출하면 만들어 둔 스크립트/음성/이미지를 재사용
+    run_id = request.form.get("run_id") or checkpoint.new_run_id("short")
 
     try:
-        output_file = youtube.create_youtube_short(api_key, topic, num_images)
-        # 자동 다운로드
-        return send_file(output_file, as_attachment=True)
+        output_file = youtube.create_youtube_short(api_key, topic, num_images, run_id=run_id)
+        # 메모리로 읽은 뒤 작업 폴더 삭제 → 자동 다운로드
+        with open(output_file, "rb") as f:
+            video = BytesIO(f.read())
+        youtube.discard_short(run_id)
+        return send_file(video, download_name=os.path.basename(output_file), as_attachment=True)
     except Exception as e:
-        return f"<h2>에러 발생</h2><pre>{e}</pre>"
+        return f"<h2>에러 발생</h2><pre>{e}</pre><p>재개 ID: {run_id}</p>"
 
 
 @app.route("/index6", methods=["GET", "POST"])
@@ -116,21 +228,26 @@ def index6():
 @app.route("/index7", methods=["GET", "POST"])
 def index7():
     error = None
+    run_id = None
     if request.method == "POST":
+        apikey = (request.form.get("apikey") or "").strip()
+        if not apikey:
+            return render_template("index7.html", error="⚠ API 키를 입력하세요.", run_id=request.form.get("run_id")), 400
         try:
-            apikey = request.form.get("apikey")
             topic = request.form.get("topic")
             language = request.form.get("language", "ko")
+            # 실패 시 같은 재개 ID로 다시 제출하면 저장된 단계부터 이어서 생성
+            run_id = request.form.get("run_id") or checkpoint.new_run_id("paper_kor" if language == "ko" else "paper_eng")
 
-            # 언어별 논문 생성기 선택
+            # 언어별 논문 생성기 선택 (비동기 병렬 생성의 동기 래퍼)
             if language == "ko":
-                from article_kor.main import generate_paper
+                from article_kor.main_async import generate_paper
             else:
-                from article_eng.main import generate_paper
+                from article_eng.main_async import generate_paper
 
             # 논문 생성
             tex_file, bib_file, asset_files, creative_title, research_topic = generate_paper(
-                topic, api_key=apikey
+                topic, api_key=apikey, run_id=run_id
             )
 
             # ZIP 파일로 묶기
@@ -148,9 +265,9 @@ def index7():
             )
 
         except Exception as e:
-            error = str(e)
+            error = f"{e} (재개 ID: {run_id})" if run_id else str(e)
 
-    return render_template("index7.html", error=error)
+    return render_template("index7.html", error=error, run_id=run_id)
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5001, debug=True)
+    app.run(host="0.0.0.0", port=5001, debug=True, threaded=True)
@@ -3,6 +3,7 @@ import os, requests, io, contextlib, traceback
 import matplotlib.pyplot as plt
 from pylatex import NoEscape
 from openai_utils import ask_question
+import llm_client
 
 # -----------------------------
 # Safe filename for sections
@@ -23,8 +24,6 @@ def safe_filename(section_title, suffix):
 # Image generation using OpenAI
 # -----------------------------
 def generate_images(api_key, topic, section_title, count=1):
-    import openai
-    openai.api_key = api_key
     os.makedirs("images", exist_ok=True)
     image_files = []
 
@@ -34,8 +33,9 @@ def generate_images(api_key, topic, section_title, count=1):
             f"of a real estate/economics paper titled '{topic}'. "
             "Do not include any brand names or real persons, focus on abstract or illustrative visualization."
         )
-        response = openai.images.generate(model="dall-e-3", prompt=prompt, size="1024x1024")
-        url = response.data[0].url
+        url = llm_client.generate_image(prompt, api_key=api_key)
+        if not url:
+            continue
         img_data = requests.get(url).content
         filename = os.path.join("images", safe_filename(section_title, f"img{i+1}"))
         with open(filename, 'wb') as f:
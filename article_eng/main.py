@@ -6,19 +6,74 @@ from . import openai_utils
 from . import text_utils
 from . import figure_utils
 from . import bib_utils
-
-def generate_paper(topic, authors=None, affiliations=None, emails=None, api_key=None):
-    # 1. Creative research title
-    creative_title = openai_utils.ask_question(
-        f"Generate a novel and creative research paper title related to real estate or economics for '{topic}'. Remove quotation marks.",
-        api_key=api_key
-    ).strip().replace('"', '').replace("'", "")
-
-    research_topic = openai_utils.ask_question(
-        f"Summarize the research topic for '{creative_title}' in 1-2 sentences in the context of real estate/economics.",
-        api_key=api_key
+import pipeline
+import checkpoint
+
+SECTION_REQUIREMENTS = {
+    "Introduction": 300,
+    "Literature Review": 350,
+    "Data & Methodology": 300,
+    "Results": 600,
+    "Discussion": 300,
+    "Conclusion": 250
+}
+SECTIONS = ["Introduction", "Literature Review", "Data & Methodology", "Results", "Discussion", "Conclusion"]
+NUM_REFS = 10
+
+# -----------------------------
+# Prompts (shared by the sync and async generators)
+# -----------------------------
+def title_prompt(topic):
+    return f"Generate a novel and creative research paper title related to real estate or economics for '{topic}'. Remove quotation marks."
+
+def clean_title(text):
+    return text.strip().replace('"', '').replace("'", "")
+
+def research_topic_prompt(creative_title):
+    return f"Summarize the research topic for '{creative_title}' in 1-2 sentences in the context of real estate/economics."
+
+def abstract_prompt(research_topic):
+    return f"Write a 180-220 word abstract for a real estate/economics paper on '{research_topic}'"
+
+def section_prompt(sec, creative_title):
+    min_words = SECTION_REQUIREMENTS.get(sec, 300)
+    if sec == "Results":
+        return (
+            f"Write the '{sec}' section for '{creative_title}' using df data. "
+            f"Include descriptive statistics, regression analysis, and interpretation. Minimum {min_words} words."
+        )
+    return f"Write the '{sec}' section for '{creative_title}', minimum {min_words} words, in real estate/economics context."
+
+def data_prompt(creative_title):
+    # Generate example dataset
+    return (
+        f"Generate example real estate or economic dataset for '{creative_title}' "
+        "as a pandas DataFrame named 'df', 5-6 columns, 20-30 rows, with numeric variables suitable for regression analysis."
     )
 
+def results_frame(data_code):
+    import pandas as pd, numpy as np
+    local_env = {"pd": pd, "np": np}
+    try:
+        if "df" not in data_code:
+            data_code = f"import pandas as pd\nimport numpy as np\ndf = {data_code}"
+        exec(data_code, local_env)
+        df = local_env.get("df", None)
+    except Exception:
+        df = pd.DataFrame({
+            "Price": np.random.rand(20) * 500000 + 50000,
+            "Size": np.random.randint(50, 200, 20),
+            "Bedrooms": np.random.randint(1, 5, 20),
+            "DistanceToCenter": np.random.rand(20) * 20,
+            "Income": np.random.randint(2000, 8000, 20)
+        })
+    return df
+
+# -----------------------------
+# Document assembly
+# -----------------------------
+def build_paper(creative_title, research_topic, abstract_text, keywords, bib_entries, section_texts, data_code,
+                authors=None, affiliations=None, emails=None):
     # 2. LaTeX setup
     doc = Document(documentclass='scrartcl', document_options=['11pt', 'a4paper'])
 
@@ -61,69 +116,25 @@ def generate_paper(topic, authors=None, affiliations=None, emails=None, api_key=
 
     # 4. Abstract / Keywords
     doc.append(NoEscape(r'\begin{abstract}'))
-    abstract_text = openai_utils.ask_question(
-        f"Write a 180-220 word abstract for a real estate/economics paper on '{research_topic}'",
-        api_key=api_key
-    )
     doc.append(NoEscape(text_utils.clean_section_text(abstract_text)))
     doc.append(NoEscape(r'\end{abstract}'))
-    doc.append(NoEscape(r'\textbf{Keywords:} ' + text_utils.extract_keywords(abstract_text, api_key=api_key)))
+    doc.append(NoEscape(r'\textbf{Keywords:} ' + keywords))
     doc.append(Command('newpage'))
 
     # 5. Bibliography
-    bib_entries = bib_utils.generate_bibtex(research_topic, 10, api_key=api_key)
     with open("references.bib", 'w', encoding='utf-8') as f:
         f.write("\n\n".join(bib_entries))
     bib_keys = [re.search(r'@.*?\{(.*?),', e).group(1) for e in bib_entries if re.search(r'@.*?\{(.*?),', e)]
 
     # 6. Sections
-    section_requirements = {
-        "Introduction": 300,
-        "Literature Review": 350,
-        "Data & Methodology": 300,
-        "Results": 600,
-        "Discussion": 300,
-        "Conclusion": 250
-    }
-    sections = ["Introduction", "Literature Review", "Data & Methodology", "Results", "Discussion", "Conclusion"]
-
-    for sec in sections:
+    for sec in SECTIONS:
         doc.append(NoEscape(f"\\section{{{sec}}}"))
-        min_words = section_requirements.get(sec, 300)
 
         if sec == "Results":
-            import pandas as pd, numpy as np
-            local_env = {"pd": pd, "np": np}
-            df = None
-
-            # Generate example dataset
-            data_prompt = (
-                f"Generate example real estate or economic dataset for '{creative_title}' "
-                "as a pandas DataFrame named 'df', 5-6 columns, 20-30 rows, with numeric variables suitable for regression analysis."
-            )
-            data_code = openai_utils.ask_question(data_prompt, api_key=api_key)
-
-            try:
-                if "df" not in data_code:
-                    data_code = f"import pandas as pd\nimport numpy as np\ndf = {data_code}"
-                exec(data_code, local_env)
-                df = local_env.get("df", None)
-            except Exception:
-                df = pd.DataFrame({
-                    "Price": np.random.rand(20) * 500000 + 50000,
-                    "Size": np.random.randint(50, 200, 20),
-                    "Bedrooms": np.random.randint(1, 5, 20),
-                    "DistanceToCenter": np.random.rand(20) * 20,
-                    "Income": np.random.randint(2000, 8000, 20)
-                })
+            df = results_frame(data_code)
 
             # Results text
-            analysis_prompt = (
-                f"Write the '{sec}' section for '{creative_title}' using df data. "
-                f"Include descriptive statistics, regression analysis, and interpretation. Minimum {min_words} words."
-            )
-            text_exp = openai_utils.ask_question(analysis_prompt, api_key=api_key)
-            text = text_utils.clean_section_text(text_exp)
+            text = text_utils.clean_section_text(section_texts[sec])
             doc.append(NoEscape(text))
 
             # Graph
@@ -143,11 +154,7 @@ def generate_paper(topic, authors=None, affiliations=None, emails=None, api_key=
 
         else:
             # Other sections
-            text_exp = openai_utils.ask_question(
-                f"Write the '{sec}' section for '{creative_title}', minimum {min_words} words, in real estate/economics context.",
-                api_key=api_key
-            )
-            text = text_utils.clean_section_text(text_exp, remove_title=True, section_title=sec)
+            text = text_utils.clean_section_text(section_texts[sec], remove_title=True, section_title=sec)
             text = text_utils.insert_cites(text, bib_keys)
             doc.append(NoEscape(text))
 
@@ -168,3 +175,49 @@ def generate_paper(topic, authors=None, affiliations=None, emails=None, api_key=
                 asset_files.append(os.path.join(folder, file))
 
     return tex_file, "references.bib", asset_files, creative_title, research_topic
+
+def paper_pipeline(api_key=None, max_workers=8):
+    """
+    Paper generation as a stage graph:
+    title -> research_topic -> abstract -> keywords,
+    research_topic -> bib_1..bib_N -> bib_entries,
+    title -> section texts / Results dataset, everything -> paper
+    """
+    def ask(question):
+        return openai_utils.ask_question(question, api_key=api_key)
+
+    p = pipeline.Pipeline("paper_eng", max_workers=max_workers)
+    p.stage("title", lambda topic: clean_title(ask(title_prompt(topic))), ["topic"], ["creative_title"])
+    p.stage("research_topic", lambda t: ask(research_topic_prompt(t)), ["creative_title"])
+    p.stage("abstract", lambda rt: ask(abstract_prompt(rt)), ["research_topic"], ["abstract_text"])
+    p.stage("keywords", lambda a: text_utils.extract_keywords(a, api_key=api_key), ["abstract_text"])
+    for i in range(1, NUM_REFS + 1):
+        p.stage(f"bib_{i}", lambda rt: ask(bib_utils.bibtex_prompt(rt)), ["research_topic"])
+    p.stage("bib_entries",
+            lambda *raw: [e for e in (bib_utils.fix_bibtex_entry(r, i) for i, r in enumerate(raw, start=1)) if e],
+            [f"bib_{i}" for i in range(1, NUM_REFS + 1)])
+    for sec in SECTIONS:
+        p.stage(f"section:{sec}", lambda t, sec=sec: ask(section_prompt(sec, t)), ["creative_title"])
+    p.stage("data_code", lambda t: ask(data_prompt(t)), ["creative_title"])
+    p.stage("section_texts", lambda *texts: dict(zip(SECTIONS, texts)), [f"section:{sec}" for sec in SECTIONS])
+    p.stage("paper", build_paper,
+            ["creative_title", "research_topic", "abstract_text", "keywords", "bib_entries", "section_texts",
+             "data_code", "authors", "affiliations", "emails"], persist=False)
+    return p
+
+def generate_paper(topic, authors=None, affiliations=None, emails=None, api_key=None, run_id=None):
+    """
+    Generate the paper; every stage result is saved under runs/<run_id>/.
+    Calling again with the same run_id skips saved stages and resumes from the first missing one.
+    The run directory is removed once the paper is built.
+    """
+    ckpt = checkpoint.open_run("paper_eng", run_id, topic=topic, authors=authors, affiliations=affiliations,
+                               emails=emails)
+    run = paper_pipeline(api_key).run(ckpt, topic=topic, authors=authors, affiliations=affiliations, emails=emails)
+    ckpt.remove()
+    return run.values["paper"]
+
+def resume_paper(run_id, api_key=None):
+    """Resume an interrupted run with the inputs stored in its meta.json."""
+    meta = checkpoint.Checkpoint.open(run_id).meta
+    return generate_paper(meta["topic"], meta["authors"], meta["affiliations"], meta["emails"], api_key, run_id)
@@ -0,0 +1,72 @@
+import asyncio
+import llm_client
+import checkpoint
+from . import main, openai_utils, text_utils, bib_utils
+
+# Max concurrent LLM requests per paper
+MAX_CONCURRENCY = 8
+
+
+async def generate_paper_async(topic, authors=None, affiliations=None, emails=None, api_key=None,
+                               max_concurrency=MAX_CONCURRENCY, run_id=None):
+    """
+    Async variant of main.generate_paper (same prompts, same output files).
+    Independent calls run concurrently; only the dependency chain
+    title -> research topic -> abstract -> keywords is sequential.
+    Stage results are checkpointed under the same names as main.paper_pipeline,
+    so a run_id can be resumed by either generator.
+    """
+    ckpt = checkpoint.open_run("paper_eng", run_id, topic=topic, authors=authors, affiliations=affiliations,
+                               emails=emails)
+    async with llm_client.AsyncSession(api_key, max_concurrency) as session:
+        async def ask(question):
+            return await session.ask(question, system=openai_utils.SYSTEM_PROMPT, max_tokens=openai_utils.MAX_TOKENS)
+
+        def step(name, question, parse=None):
+            async def make():
+                answer = await ask(question)
+                return parse(answer) if parse else answer
+            return checkpoint.cached_async(ckpt, name, make)
+
+        async def abstract_and_keywords(research_topic):
+            abstract_text = await step("abstract", main.abstract_prompt(research_topic))
+            keywords = await step("keywords", text_utils.keywords_prompt(abstract_text), text_utils.parse_keywords)
+            return abstract_text, keywords
+
+        async def bibtex(research_topic):
+            raw = await asyncio.gather(*(step(f"bib_{i}", bib_utils.bibtex_prompt(research_topic))
+                                         for i in range(1, main.NUM_REFS + 1)))
+            entries = [bib_utils.fix_bibtex_entry(r, i) for i, r in enumerate(raw, start=1)]
+            return [e for e in entries if e]
+
+        # 1. Title first: every other prompt depends on it
+        creative_title = await step("title", main.title_prompt(topic), main.clean_title)
+
+        # 2. Sections and the Results dataset only need the title → start them now
+        sections = asyncio.gather(*(step(f"section:{sec}", main.section_prompt(sec, creative_title))
+                                     for sec in main.SECTIONS))
+        data_code = asyncio.ensure_future(step("data_code", main.data_prompt(creative_title)))
+
+        # 3. Abstract/keywords and bibliography need the research topic
+        research_topic = await step("research_topic", main.research_topic_prompt(creative_title))
+        (abstract_text, keywords), bib_entries, section_list, data_code = await asyncio.gather(
+            abstract_and_keywords(research_topic), bibtex(research_topic), sections, data_code
+        )
+
+    section_texts = dict(zip(main.SECTIONS, section_list))
+    paper = main.build_paper(creative_title, research_topic, abstract_text, keywords, bib_entries, section_texts,
+                            data_code, authors, affiliations, emails)
+    ckpt.remove()
+    return paper
+
+def generate_paper(topic, authors=None, affiliations=None, emails=None, api_key=None,
+                   max_concurrency=MAX_CONCURRENCY, run_id=None):
+    """Sync wrapper with the same signature/return value as main.generate_paper."""
+    return asyncio.run(generate_paper_async(topic, authors, affiliations, emails, api_key, max_concurrency,
+                                           run_id))
+
+def resume_paper(run_id, api_key=None, max_concurrency=MAX_CONCURRENCY):
+    """Resume an interrupted run with the inputs stored in its meta.json."""
+    meta = checkpoint.Checkpoint.open(run_id).meta
+    return generate_paper(meta["topic"], meta["authors"], meta["affiliations"], meta["emails"], api_key,
+                          max_concurrency, run_id)
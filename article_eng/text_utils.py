@@ -8,20 +8,23 @@ def clean_section_text(text, remove_title=False, section_title=""):
         text = re.sub(rf'^{section_title}\s*', '', text, flags=re.MULTILINE)
     return text.strip()
 
-def extract_keywords(text, num=8, api_key=None, language="en"):
-    prompt = (
+def keywords_prompt(text, num=8, language="en"):
+    return (
         f"Extract {num} most relevant keywords from the following text, "
         "focusing on economics or real estate context. "
         "Return them as a comma-separated list.\n\n"
         f"{text}"
     )
 
-    keywords_text = ask_question(prompt, language=language, api_key=api_key)
-
+def parse_keywords(keywords_text, num=8):
     # Clean up and return first 'num' keywords
     keywords = [k.strip() for k in keywords_text.replace('\n','').split(',') if k.strip()]
     return ', '.join(keywords[:num])
 
+def extract_keywords(text, num=8, api_key=None, language="en"):
+    keywords_text = ask_question(keywords_prompt(text, num, language), language=language, api_key=api_key)
+    return parse_keywords(keywords_text, num)
+
 def insert_cites(text, bib_keys, prob=0.2):
     sentences = re.split(r'(?<=[.!?])\s+', text)
     for i, s in enumerate(sentences):
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 from . import openai_utils, figure_utils, text_utils
 from pylatex import NoEscape, Command
+import pipeline
 
 def generate_synthetic_data_for_model(topic):
     """
@@ -39,18 +40,8 @@ def generate_synthetic_data_for_model(topic):
     return df
 
 
-def generate_analysis_section(doc, creative_title, sec, min_words, api_key=None):
-    """
-    '분석' 섹션 전용 생성
-    - 수학 모델 기반 가상 데이터 생성
-    - GPT 분석 텍스트 작성 (필요 시 LaTeX 소제목 자동 포함)
-    - 그래프/표 삽입
-    """
-    # 1. 수학 모델용 테스트 데이터 생성
-    df = generate_synthetic_data_for_model(creative_title)
-
-    # 2. GPT 분석 텍스트 작성
-    analysis_prompt = (
+def analysis_prompt(creative_title, sec, min_words, df):
+    return (
         f"'{creative_title}' 주제의 '{sec}' 섹션을 작성하라. "
         f"다음 데이터는 이 주제에 대한 수학 모델의 테스트용 데이터이다. "
         f"모델의 가정, 추정, 해석, 결론을 단계적으로 설명하라. "
@@ -62,28 +53,76 @@ def generate_analysis_section(doc, creative_title, sec, min_words, api_key=None)
         "이 데이터를 수학적 또는 통계적으로 해석하는 학술 분석을 작성하라."
     )
 
-    text_exp = openai_utils.ask_question(analysis_prompt, api_key=api_key)
-    text = text_utils.clean_section_text(text_exp)
 
-    # GPT가 \subsection 등 LaTeX 명령어를 직접 포함할 수 있음 → NoEscape 사용
-    doc.append(NoEscape(text))
-
-    # 3. 그래프 생성 및 삽입
+def analysis_figure(sec, df, creative_title):
     try:
-        fig = figure_utils.generate_graph_from_df(sec, df, creative_title)
-        if fig:
-            figure_utils.insert_figure(doc, fig, f"{sec} 관련 그래프", placement='H')
+        return figure_utils.generate_graph_from_df(sec, df, creative_title)
     except Exception as e:
         print(f"[그래프 생성 실패: {e}]")
+        return None
+
 
-    # 4. 표 삽입
+def analysis_table(sec, df):
     try:
-        table_latex = df.to_latex(index=False, longtable=False, caption=f"{sec} 관련 데이터 요약", label=f"tab:{sec}")
-        doc.append(NoEscape(r"\begin{table}[H]\centering" + table_latex + r"\end{table}"))
+        return df.to_latex(index=False, longtable=False, caption=f"{sec} 관련 데이터 요약", label=f"tab:{sec}")
     except Exception as e:
         print(f"[표 생성 실패: {e}]")
+        return None
+
+
+def insert_analysis(doc, sec, text_exp, fig, table_latex):
+    """
+    분석 텍스트 + 그래프/표를 문서에 추가
+    """
+    text = text_utils.clean_section_text(text_exp)
+
+    # GPT가 \subsection 등 LaTeX 명령어를 직접 포함할 수 있음 → NoEscape 사용
+    doc.append(NoEscape(text))
+
+    # 그래프 삽입
+    if fig:
+        try:
+            figure_utils.insert_figure(doc, fig, f"{sec} 관련 그래프", placement='H')
+        except Exception as e:
+            print(f"[그래프 생성 실패: {e}]")
+
+    # 표 삽입
+    if table_latex:
+        doc.append(NoEscape(r"\begin{table}[H]\centering" + table_latex + r"\end{table}"))
 
     # 섹션 끝에 페이지 나누기
     doc.append(Command('newpage'))
 
-    return df
+
+def append_analysis_section(doc, creative_title, sec, df, text_exp):
+    insert_analysis(doc, sec, text_exp, analysis_figure(sec, df, creative_title), analysis_table(sec, df))
+
+
+def add_analysis_stages(p, sec, min_words, api_key=None, prefix="analysis"):
+    """
+    분석 섹션 단계를 파이프라인에 추가 (입력: creative_title)
+    - {prefix}_data → {prefix}_text / {prefix}_figure / {prefix}_table (병렬)
+    """
+    df_name = f"{prefix}_df"
+    # 데이터/그래프/표는 고정 시드로 다시 만들 수 있으므로 체크포인트에 저장하지 않음 (본문만 저장)
+    p.stage(f"{prefix}_data", generate_synthetic_data_for_model, ["creative_title"], [df_name], persist=False)
+    p.stage(f"{prefix}_text",
+            lambda t, df: openai_utils.ask_question(analysis_prompt(t, sec, min_words, df), api_key=api_key),
+            ["creative_title", df_name])
+    p.stage(f"{prefix}_figure", lambda t, df: analysis_figure(sec, df, t), ["creative_title", df_name],
+            persist=False)
+    p.stage(f"{prefix}_table", lambda df: analysis_table(sec, df), [df_name], persist=False)
+    return p
+
+
+def generate_analysis_section(doc, creative_title, sec, min_words, api_key=None):
+    """
+    '분석' 섹션 전용 생성
+    - 수학 모델 기반 가상 데이터 생성
+    - GPT 분석 텍스트 작성 (필요 시 LaTeX 소제목 자동 포함)
+    - 그래프/표 삽입
+    """
+    p = add_analysis_stages(pipeline.Pipeline("analysis", max_workers=3), sec, min_words, api_key)
+    v = p.run(creative_title=creative_title).values
+    insert_analysis(doc, sec, v["analysis_text"], v["analysis_figure"], v["analysis_table"])
+    return v["analysis_df"]
@@ -2,6 +2,7 @@ import pandas, os, requests, io, contextlib, traceback
 import matplotlib.pyplot as plt
 from pylatex import NoEscape
 from openai_utils import ask_question
+import llm_client
 
 # -----------------------------
 # 파일명 안전 처리
@@ -20,15 +21,14 @@ def safe_filename(section_title, suffix):
 # 이미지 생성
 # -----------------------------
 def generate_images(api_key, topic, section_title, count=1):
-    import openai
-    openai.api_key = api_key
     os.makedirs("images", exist_ok=True)
     image_files = []
 
     for i in range(count):
         prompt = f"'{topic}' '{section_title}' 섹션용 학술 시각 자료 생성"
-        response = openai.images.generate(model="dall-e-3", prompt=prompt, size="1024x1024")
-        url = response.data[0].url
+        url = llm_client.generate_image(prompt, api_key=api_key)
+        if not url:
+            continue
         img_data = requests.get(url).content
         filename = os.path.join("images", safe_filename(section_title, f"img{i+1}"))
         with open(filename, 'wb') as f:
@@ -3,21 +3,51 @@ sys.path.append(os.path.dirname(__file__))  # main.py 기준
 from pylatex import Document, Command, NoEscape, Package
 import re
 from . import openai_utils, text_utils, figure_utils, bib_utils, analysis_utils
-
-def generate_paper(topic, authors=None, affiliations=None, emails=None, api_key=None):
-    # ---------------------------
-    # 1. 제목 / 주제 요약
-    # ---------------------------
-    creative_title = openai_utils.ask_question(
-        f"'{topic}'와 관련되면서 창의적이고 아직 시도되지 않은 연구 논문 제목을 생성하세요. 인용부호 제거",
-        api_key=api_key
-    ).strip().replace('"', '').replace("'", "")
-
-    research_topic = openai_utils.ask_question(
-        f"'{creative_title}'에 해당하는 연구 주제를 1~2문장으로 요약하세요.",
-        api_key=api_key
-    )
-
+import pipeline
+import checkpoint
+
+SECTION_REQUIREMENTS = {
+    "서론": 300,
+    "관련 연구": 550,
+    "연구 방법": 400,
+    "분석": 600,
+    "결론": 500
+}
+SECTIONS = ["서론", "관련 연구", "연구 방법", "분석", "결론"]
+ANALYSIS_SECTION = "분석"
+NUM_REFS = 10
+
+# ---------------------------
+# 프롬프트 (동기/비동기 생성기 공용)
+# ---------------------------
+def title_prompt(topic):
+    return f"'{topic}'와 관련되면서 창의적이고 아직 시도되지 않은 연구 논문 제목을 생성하세요. 인용부호 제거"
+
+def clean_title(text):
+    return text.strip().replace('"', '').replace("'", "")
+
+def research_topic_prompt(creative_title):
+    return f"'{creative_title}'에 해당하는 연구 주제를 1~2문장으로 요약하세요."
+
+def abstract_prompt(research_topic):
+    return f"'{research_topic}'에 대한 논문 초록을 180~220단어로 작성"
+
+def section_stage(sec):
+    # 단계(체크포인트) 이름: 분석 섹션은 analysis_utils.add_analysis_stages의 본문 단계와 같은 이름
+    return "analysis_text" if sec == ANALYSIS_SECTION else f"section:{sec}"
+
+def section_prompt(sec, creative_title):
+    min_words = SECTION_REQUIREMENTS.get(sec, 300)
+    if sec == ANALYSIS_SECTION:
+        df = analysis_utils.generate_synthetic_data_for_model(creative_title)
+        return analysis_utils.analysis_prompt(creative_title, sec, min_words, df)
+    return f"'{creative_title}' '{sec}' 섹션 작성, 최소 {min_words}단어 이상."
+
+# ---------------------------
+# 문서 조립
+# ---------------------------
+def build_paper(creative_title, research_topic, abstract_text, keywords, bib_entries, section_texts,
+                authors=None, affiliations=None, emails=None, analysis_assets=None):
     # ---------------------------
     # 2. 문서 기본 설정
     # ---------------------------
@@ -66,13 +96,9 @@ def generate_paper(topic, authors=None, affiliations=None, emails=None, api_key=
     # 4. 초록 / 키워드
     # ---------------------------
     doc.append(NoEscape(r'\begin{abstract}'))
-    abstract_text = openai_utils.ask_question(
-        f"'{research_topic}'에 대한 논문 초록을 180~220단어로 작성",
-        api_key=api_key
-    )
     doc.append(NoEscape(text_utils.clean_section_text(abstract_text)))
     doc.append(NoEscape(r'\end{abstract}'))
-    doc.append(NoEscape(r'\textbf{키워드:} ' + text_utils.extract_keywords(abstract_text, api_key=api_key)))
+    doc.append(NoEscape(r'\textbf{키워드:} ' + keywords))
     doc.append(Command('newpage'))
 
     # 목차
@@ -80,39 +106,27 @@ def generate_paper(topic, authors=None, affiliations=None, emails=None, api_key=
     doc.append(Command('newpage'))
 
     # ---------------------------
-    # 5. 참고문헌 생성
+    # 5. 참고문헌 저장
     # ---------------------------
-    bib_entries = bib_utils.generate_bibtex(research_topic, 10, api_key=api_key)
     with open("references.bib", 'w', encoding='utf-8') as f:
         f.write("\n\n".join(bib_entries))
     bib_keys = [re.search(r'@.*?\{(.*?),', e).group(1) for e in bib_entries if re.search(r'@.*?\{(.*?),', e)]
 
     # ---------------------------
-    # 6. 섹션별 본문 작성
+    # 6. 섹션별 본문
     # ---------------------------
-    section_requirements = {
-        "서론": 300,
-        "관련 연구": 550,
-        "연구 방법": 400,
-        "분석": 600,
-        "결론": 500
-    }
-    sections = ["서론", "관련 연구", "연구 방법", "분석", "결론"]
-
-    for sec in sections:
+    for sec in SECTIONS:
         doc.append(NoEscape(f"\\section{{{sec}}}"))
-        min_words = section_requirements.get(sec, 300)
 
-        if sec == "분석":
-            analysis_utils.generate_analysis_section(
-                doc, creative_title, sec, min_words, api_key
-            )
+        if sec == ANALYSIS_SECTION:
+            # analysis_assets: 파이프라인에서 미리 만든 (그래프 경로, 표 LaTeX)
+            if analysis_assets is None:
+                df = analysis_utils.generate_synthetic_data_for_model(creative_title)
+                analysis_utils.append_analysis_section(doc, creative_title, sec, df, section_texts[sec])
+            else:
+                analysis_utils.insert_analysis(doc, sec, section_texts[sec], *analysis_assets)
         else:
-            text_exp = openai_utils.ask_question(
-                f"'{creative_title}' '{sec}' 섹션 작성, 최소 {min_words}단어 이상.",
-                api_key=api_key
-            )
-            text = text_utils.clean_section_text(text_exp, remove_title=True, section_title=sec)
+            text = text_utils.clean_section_text(section_texts[sec], remove_title=True, section_title=sec)
             text = text_utils.insert_cites(text, bib_keys)
             doc.append(NoEscape(text))
             doc.append(Command('newpage'))
@@ -136,3 +150,56 @@ def generate_paper(topic, authors=None, affiliations=None, emails=None, api_key=
                 asset_files.append(os.path.join(folder, file))
 
     return tex_file, "references.bib", asset_files, creative_title, research_topic
+
+def paper_pipeline(api_key=None, max_workers=8):
+    """
+    논문 생성 단계 그래프
+    - 제목 → 주제 요약 → 초록 → 키워드
+    - 주제 요약 → 참고문헌 1..N → bib_entries
+    - 제목 → 섹션 본문, 분석 섹션(데이터 → 본문/그래프/표)
+    - 전체 → paper (문서 조립)
+    """
+    def ask(question):
+        return openai_utils.ask_question(question, api_key=api_key)
+
+    text_sections = [sec for sec in SECTIONS if sec != ANALYSIS_SECTION]
+    p = pipeline.Pipeline("paper_kor", max_workers=max_workers)
+    p.stage("title", lambda topic: clean_title(ask(title_prompt(topic))), ["topic"], ["creative_title"])
+    p.stage("research_topic", lambda t: ask(research_topic_prompt(t)), ["creative_title"])
+    p.stage("abstract", lambda rt: ask(abstract_prompt(rt)), ["research_topic"], ["abstract_text"])
+    p.stage("keywords", lambda a: text_utils.extract_keywords(a, api_key=api_key), ["abstract_text"])
+    for i in range(1, NUM_REFS + 1):
+        p.stage(f"bib_{i}", lambda rt: openai_utils.ask_question(bib_utils.bibtex_prompt(rt), api_key=api_key),
+                ["research_topic"])
+    p.stage("bib_entries",
+            lambda *raw: [e for e in (bib_utils.fix_bibtex_entry(r, i) for i, r in enumerate(raw, start=1)) if e],
+            [f"bib_{i}" for i in range(1, NUM_REFS + 1)])
+    for sec in text_sections:
+        p.stage(section_stage(sec), lambda t, sec=sec: ask(section_prompt(sec, t)), ["creative_title"])
+    analysis_utils.add_analysis_stages(p, ANALYSIS_SECTION, SECTION_REQUIREMENTS[ANALYSIS_SECTION], api_key)
+    p.stage("section_texts",
+            lambda analysis_text, *texts: {ANALYSIS_SECTION: analysis_text, **dict(zip(text_sections, texts))},
+            [section_stage(ANALYSIS_SECTION)] + [section_stage(sec) for sec in text_sections])
+    p.stage("analysis_assets", lambda fig, table: (fig, table), ["analysis_figure", "analysis_table"],
+            persist=False)
+    p.stage("paper", build_paper,
+            ["creative_title", "research_topic", "abstract_text", "keywords", "bib_entries", "section_texts",
+             "authors", "affiliations", "emails", "analysis_assets"], persist=False)
+    return p
+
+def generate_paper(topic, authors=None, affiliations=None, emails=None, api_key=None, run_id=None):
+    """
+    논문 생성 (단계 결과는 runs/<run_id>/에 저장)
+    - 같은 run_id로 다시 호출하면 저장된 단계는 건너뛰고 첫 번째 누락 단계부터 진행
+    - 논문 파일을 만든 뒤에는 실행 폴더 삭제
+    """
+    ckpt = checkpoint.open_run("paper_kor", run_id, topic=topic, authors=authors, affiliations=affiliations,
+                               emails=emails)
+    run = paper_pipeline(api_key).run(ckpt, topic=topic, authors=authors, affiliations=affiliations, emails=emails)
+    ckpt.remove()
+    return run.values["paper"]
+
+def resume_paper(run_id, api_key=None):
+    # 저장된 입력값(meta.json)으로 중단된 실행 재개
+    meta = checkpoint.Checkpoint.open(run_id).meta
+    return generate_paper(meta["topic"], meta["authors"], meta["affiliations"], meta["emails"], api_key, run_id)
@@ -0,0 +1,70 @@
+import asyncio
+import llm_client
+import checkpoint
+from . import main, openai_utils, text_utils, bib_utils
+
+# 논문 1편당 동시 LLM 요청 수
+MAX_CONCURRENCY = 8
+
+
+async def generate_paper_async(topic, authors=None, affiliations=None, emails=None, api_key=None,
+                               max_concurrency=MAX_CONCURRENCY, run_id=None):
+    """
+    main.generate_paper의 비동기 버전 (프롬프트/결과 파일 동일)
+    - 서로 의존하지 않는 요청은 동시에 실행
+    - 순차 구간: 제목 → 주제 요약 → 초록 → 키워드
+    - 단계 결과는 main.paper_pipeline과 같은 이름으로 저장 → 어느 생성기로든 같은 run_id 재개 가능
+    """
+    ckpt = checkpoint.open_run("paper_kor", run_id, topic=topic, authors=authors, affiliations=affiliations,
+                               emails=emails)
+    async with llm_client.AsyncSession(api_key, max_concurrency) as session:
+        async def ask(question):
+            return await session.ask(question, system=openai_utils.system_prompt(), max_tokens=openai_utils.MAX_TOKENS)
+
+        def step(name, question, parse=None):
+            async def make():
+                answer = await ask(question)
+                return parse(answer) if parse else answer
+            return checkpoint.cached_async(ckpt, name, make)
+
+        async def abstract_and_keywords(research_topic):
+            abstract_text = await step("abstract", main.abstract_prompt(research_topic))
+            keywords = await step("keywords", text_utils.keywords_prompt(abstract_text), text_utils.parse_keywords)
+            return abstract_text, keywords
+
+        async def bibtex(research_topic):
+            raw = await asyncio.gather(*(step(f"bib_{i}", bib_utils.bibtex_prompt(research_topic))
+                                         for i in range(1, main.NUM_REFS + 1)))
+            entries = [bib_utils.fix_bibtex_entry(r, i) for i, r in enumerate(raw, start=1)]
+            return [e for e in entries if e]
+
+        # 1. 제목 (이후 모든 요청이 의존)
+        creative_title = await step("title", main.title_prompt(topic), main.clean_title)
+
+        # 2. 섹션 본문은 제목만 필요 → 바로 시작
+        sections = asyncio.gather(*(step(main.section_stage(sec), main.section_prompt(sec, creative_title))
+                                     for sec in main.SECTIONS))
+
+        # 3. 초록/키워드, 참고문헌은 주제 요약 이후
+        research_topic = await step("research_topic", main.research_topic_prompt(creative_title))
+        (abstract_text, keywords), bib_entries, section_list = await asyncio.gather(
+            abstract_and_keywords(research_topic), bibtex(research_topic), sections
+        )
+
+    section_texts = dict(zip(main.SECTIONS, section_list))
+    paper = main.build_paper(creative_title, research_topic, abstract_text, keywords, bib_entries, section_texts,
+                            authors, affiliations, emails)
+    ckpt.remove()
+    return paper
+
+def generate_paper(topic, authors=None, affiliations=None, emails=None, api_key=None,
+                   max_concurrency=MAX_CONCURRENCY, run_id=None):
+    """동기 래퍼 (main.generate_paper와 같은 인자/반환값)"""
+    return asyncio.run(generate_paper_async(topic, authors, affiliations, emails, api_key, max_concurrency,
+                                           run_id))
+
+def resume_paper(run_id, api_key=None, max_concurrency=MAX_CONCURRENCY):
+    # 저장된 입력값(meta.json)으로 중단된 실행 재개
+    meta = checkpoint.Checkpoint.open(run_id).meta
+    return generate_paper(meta["topic"], meta["authors"], meta["affiliations"], meta["emails"], api_key,
+                          max_concurrency, run_id)
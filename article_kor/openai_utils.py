@@ -1,12 +1,11 @@
-import openai
-def ask_question(question, language="ko", api_key=None):
-    if api_key:
-        import openai
-        openai.api_key = api_key
+import llm_client
+
+MAX_TOKENS = 3000
 
+def system_prompt(language="ko"):
     # 프롬프트 구체화
     if language == "ko":
-        system_prompt = (
+        return (
             "당신은 SCI/KCI 수준의 학술 논문 작성 전문가입니다. "
             "주어진 주제에 대해 다음 사항을 지켜 작성하세요:\n"
             "1. 전문적이고 학술적인 어휘 사용\n"
@@ -16,7 +15,7 @@ def ask_question(question, language="ko", api_key=None):
             "5. 명확하고 중립적인 기술 방식 유지"
         )
     else:
-        system_prompt = (
+        return (
             "You are an expert in academic paper writing at SCI/KCI level. "
             "Follow these rules:\n"
             "1. Use professional, academic vocabulary.\n"
@@ -26,13 +25,5 @@ def ask_question(question, language="ko", api_key=None):
             "5. Keep writing neutral, clear, and precise."
         )
 
-    response = openai.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": question}
-        ],
-        temperature=0.7,
-        max_completion_tokens=3000
-    )
-    return response.choices[0].message.content.strip()
+def ask_question(question, language="ko", api_key=None):
+    return llm_client.ask(question, system=system_prompt(language), api_key=api_key, max_tokens=MAX_TOKENS)
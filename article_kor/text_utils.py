@@ -10,8 +10,8 @@ def clean_section_text(text, remove_title=False, section_title=""):
     return text.strip()
 
 
-def extract_keywords(text, num=8, api_key=None, language="ko"):
-    prompt = (
+def keywords_prompt(text, num=8, language="ko"):
+    return (
         f"다음 텍스트에서 의미 있는 핵심 키워드 {num}개만 추출하고, "
         "쉼표로 구분해서 출력해 주세요.\n\n"
         f"{text}"
@@ -21,12 +21,15 @@ def extract_keywords(text, num=8, api_key=None, language="ko"):
         f"{text}"
     )
 
-    keywords_text = ask_question(prompt, language=language, api_key=api_key)
-    
+def parse_keywords(keywords_text, num=8):
     # 모델 출력 후 공백 제거, 단어별로 쉼표 연결
     keywords = [k.strip() for k in keywords_text.replace('\n','').split(',') if k.strip()]
     return ', '.join(keywords[:num])
 
+def extract_keywords(text, num=8, api_key=None, language="ko"):
+    keywords_text = ask_question(keywords_prompt(text, num, language), language=language, api_key=api_key)
+    return parse_keywords(keywords_text, num)
+
 def insert_cites(text, bib_keys, prob=0.2):
     sentences = re.split(r'(?<=[.!?])\s+', text)
     for i, s in enumerate(sentences):
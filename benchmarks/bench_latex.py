@@ -0,0 +1,103 @@
+"""
+일반(cold) 컴파일 vs 사전 컴파일 포맷(.fmt) 컴파일 시간 비교
+
+    python -m benchmarks.bench_latex --chapters 5 10 --repeat 3 --output bench_latex.json
+
+- PDF 캐시는 끄고, 매 회 보조 파일(.aux/.toc 등)을 지워 두 방식 모두 같은 패스 수로 측정
+- SOURCE_DATE_EPOCH로 PDF 날짜/ID를 고정해 두 방식의 PDF가 바이트 단위로 같은지(same_pdf)도 기록
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import numpy as np
+import latex_build
+
+# ebook.generate_latex와 같은 프리앰블 (scrbook + kotex)
+PREAMBLE = "\\documentclass[a5paper,pagesize,10pt]{scrbook}%\n\\usepackage{kotex}%\n"
+PARAGRAPH = "한글 본문 문단입니다. 전자책 컴파일 시간 측정을 위한 예시 문장입니다. " * 20
+
+
+def make_tex(path, chapters):
+    body = "".join(f"\\chapter{{소주제 {i+1}}}\n\\large{{{PARAGRAPH}}}\n\\newpage\n" for i in range(chapters))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(PREAMBLE + "\\begin{document}\n\\tableofcontents\n\\newpage\n" + body + "\\end{document}\n")
+
+
+def clean_outputs(tex_path):
+    stem = os.path.splitext(tex_path)[0]
+    for ext in latex_build.AUX_EXTENSIONS + (".log", ".pdf"):
+        if os.path.exists(stem + ext):
+            os.remove(stem + ext)
+
+
+def engine_version():
+    out = subprocess.run([latex_build.ENGINE, "--version"], stdout=subprocess.PIPE, text=True).stdout
+    return out.splitlines()[0] if out else None
+
+
+def bench_compile(tex_path, use_format, fmt_dir, repeat):
+    times = []
+    for _ in range(repeat):
+        clean_outputs(tex_path)
+        t0 = time.perf_counter()
+        latex_build.compile_pdf(tex_path, use_format=use_format, fmt_dir=fmt_dir, cache_dir=None)
+        times.append((time.perf_counter() - t0) * 1000)
+    times = np.array(times)
+    with open(os.path.splitext(tex_path)[0] + ".pdf", "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    return {
+        "p50_ms": round(float(np.percentile(times, 50)), 1),
+        "mean_ms": round(float(times.mean()), 1),
+        "pdf_sha1": digest,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="문서별 컴파일 횟수")
+    parser.add_argument("--chapters", type=int, nargs="*", default=[5, 20], help="문서별 장(chapter) 수")
+    parser.add_argument("--output", default=None, help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    if shutil.which(latex_build.ENGINE) is None:
+        parser.error(f"{latex_build.ENGINE}를 찾을 수 없습니다.")
+
+    # 날짜와 /ID를 고정해야 두 방식의 PDF를 바이트 단위로 비교할 수 있음
+    os.environ.update(SOURCE_DATE_EPOCH="0", FORCE_SOURCE_DATE="1")
+    report = []
+    env = {"engine": engine_version(), "repeat": args.repeat}
+    print(json.dumps(env, ensure_ascii=False))
+    with tempfile.TemporaryDirectory() as tmp:
+        fmt_dir = os.path.join(tmp, ".fmt")
+        # 포맷 생성 시간은 최초 1회만 발생하므로 따로 기록
+        t0 = time.perf_counter()
+        latex_build.ensure_format(PREAMBLE, fmt_dir)
+        env["format_build_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        print(json.dumps({"format_build_ms": env["format_build_ms"]}))
+
+        for chapters in args.chapters:
+            tex_path = os.path.join(tmp, f"book_{chapters}.tex")
+            make_tex(tex_path, chapters)
+            rows = []
+            for mode, use_format in (("cold", False), ("precompiled", True)):
+                row = {"chapters": chapters, "mode": mode}
+                row.update(bench_compile(tex_path, use_format, fmt_dir, args.repeat))
+                rows.append(row)
+            same = len({row["pdf_sha1"] for row in rows}) == 1
+            for row in rows:
+                row["same_pdf"] = same
+                report.append(row)
+                print(json.dumps(row, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"env": env, "results": report}, f, ensure_ascii=False, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
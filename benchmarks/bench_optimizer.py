@@ -0,0 +1,121 @@
+"""
+식단 최적화 단계별 성능 측정 (CSV 로드 / 모델 구성 / 풀이 / 결과 추출)
+
+    python -m benchmarks.bench_optimizer --sizes 10 100 1000 10000 100000 --output bench.json
+
+외부 네트워크 없이 PuLP에 포함된 CBC(와 scipy가 있으면 HiGHS)만 사용
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import numpy as np
+from optimizer.catalog import load_catalog
+from optimizer.model import MenuModel
+from optimizer.menu import summarize_plan
+from optimizer.relax import RelaxedModel
+from optimizer.solvers import highs_available
+from benchmarks.synthetic import make_frame, make_targets
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+
+def _ms(t0):
+    return (time.perf_counter() - t0) * 1000
+
+
+def _percentiles(values):
+    values = np.asarray(values)
+    return {"p50_ms": round(float(np.percentile(values, 50)), 3),
+            "p99_ms": round(float(np.percentile(values, 99)), 3),
+            "max_ms": round(float(values.max()), 3)}
+
+
+def bench_size(n, backends, repeat, time_limit, seed=0):
+    """카탈로그 크기 n에 대한 단계별 시간 (ms)"""
+    row = {"items": n}
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "menu_data.csv")
+        make_frame(n, seed).to_csv(csv_path, index=False)
+        t0 = time.perf_counter()
+        catalog = load_catalog(csv_path)
+        row["csv_load_ms"] = round(_ms(t0), 3)
+
+    t0 = time.perf_counter()
+    model = MenuModel(catalog)
+    row["model_build_ms"] = round(_ms(t0), 3)
+
+    t0 = time.perf_counter()
+    relaxed = RelaxedModel(catalog)
+    row["relaxed_build_ms"] = round(_ms(t0), 3)
+
+    targets = make_targets(repeat, seed)
+    for backend in backends:
+        solve_times, extract_times, statuses = [], [], {}
+        for cal, protein, budget in targets:
+            t0 = time.perf_counter()
+            res = model.solve(cal, protein, budget, backend=backend, time_limit=time_limit)
+            solve_times.append(_ms(t0))
+            statuses[res.status] = statuses.get(res.status, 0) + 1
+            if res.feasible:
+                t0 = time.perf_counter()
+                summarize_plan(catalog, res.x)
+                extract_times.append(_ms(t0))
+        row[f"solve_{backend}"] = _percentiles(solve_times)
+        row[f"solve_{backend}"]["status"] = statuses
+        if extract_times:
+            row[f"extract_{backend}"] = _percentiles(extract_times)
+
+    approx_times = []
+    for cal, protein, budget in targets:
+        t0 = time.perf_counter()
+        x, _, _ = relaxed.solve_lp(cal, protein)
+        relaxed.round_plan(x, cal, protein)
+        approx_times.append(_ms(t0))
+    row["solve_approx"] = _percentiles(approx_times)
+    return row
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="*", default=DEFAULT_SIZES, help="가상 카탈로그 크기")
+    parser.add_argument("--repeat", type=int, default=10, help="크기별 풀이 횟수")
+    parser.add_argument("--time-limit", type=float, default=30, help="풀이 1회 시간 제한(초)")
+    parser.add_argument("--backends", nargs="*", default=None, help="highs / cbc (기본: 사용 가능한 전부)")
+    parser.add_argument("--output", default=None, help="JSON 결과 파일 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    backends = args.backends or (["highs", "cbc"] if highs_available() else ["cbc"])
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "time_limit": args.time_limit,
+        "results": [],
+    }
+    for n in args.sizes:
+        report["results"].append(bench_size(n, backends, args.repeat, args.time_limit))
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+HiGHS(프로세스 내부) vs CBC(외부 프로세스) 응답 시간 비교
+
+    python -m benchmarks.bench_solvers --repeat 50
+"""
+import argparse
+import json
+import time
+import numpy as np
+from optimizer.catalog import get_catalog
+from optimizer.model import MenuModel
+from optimizer.solvers import highs_available
+from benchmarks.synthetic import make_catalog, make_targets
+
+
+def bench_model(model, backend, targets):
+    times = []
+    for cal, protein, budget in targets:
+        t0 = time.perf_counter()
+        model.solve(cal, protein, budget, backend=backend)
+        times.append((time.perf_counter() - t0) * 1000)
+    times = np.array(times)
+    return {
+        "p50_ms": round(float(np.percentile(times, 50)), 3),
+        "p99_ms": round(float(np.percentile(times, 99)), 3),
+        "mean_ms": round(float(times.mean()), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=30, help="카탈로그별 풀이 횟수")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1000, 10000], help="가상 카탈로그 크기")
+    args = parser.parse_args()
+
+    catalogs = [("bundled", get_catalog())] + [(f"synthetic-{n}", make_catalog(n)) for n in args.sizes]
+    backends = ["highs", "cbc"] if highs_available() else ["cbc"]
+    targets = make_targets(args.repeat)
+
+    report = []
+    for name, catalog in catalogs:
+        model = MenuModel(catalog)
+        for backend in backends:
+            row = {"catalog": name, "items": len(catalog), "backend": backend}
+            row.update(bench_model(model, backend, targets))
+            report.append(row)
+            print(json.dumps(row, ensure_ascii=False))
+    return report
+
+
+if __name__ == "__main__":
+    main()
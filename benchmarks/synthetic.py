@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+from optimizer.catalog import MenuCatalog
+
+
+def make_frame(n, seed=0):
+    """
+    data/menu_data.csv와 같은 스키마(name, cost, cal, protein)의 가상 메뉴 생성
+    - 비용은 칼로리/단백질에 대략 비례하도록 (실제 데이터와 비슷한 단가)
+    """
+    rng = np.random.default_rng(seed)
+    cal = rng.integers(20, 600, n)
+    protein = rng.integers(0, 35, n)
+    cost = np.round((cal * 1.5 + protein * 30) * rng.uniform(0.6, 1.6, n), -1) + 100
+    return pd.DataFrame({
+        "name": [f"메뉴_{i}" for i in range(n)],
+        "cost": cost.astype(int),
+        "cal": cal,
+        "protein": protein,
+    })
+
+
+def make_catalog(n, seed=0):
+    df = make_frame(n, seed)
+    return MenuCatalog.from_frame(df, version=f"synthetic-{n}-{seed}")
+
+
+def make_targets(count, seed=0):
+    """(cal_target, protein_target, budget_limit) 시나리오 목록"""
+    rng = np.random.default_rng(seed)
+    cal = rng.integers(2000, 3200, count)
+    protein = rng.integers(50, 120, count)
+    budget = rng.integers(9000, 20000, count).astype(float)
+    return list(zip(cal.tolist(), protein.tolist(), budget.tolist()))
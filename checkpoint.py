@@ -0,0 +1,131 @@
+"""
+실행(run)별 체크포인트 디렉터리
+- 단계가 끝날 때마다 결과를 runs/<run_id>/<단계>.json에 저장 (임시 파일 → os.replace)
+- 같은 run_id로 다시 실행하면 저장된 단계는 건너뛰고 첫 번째 누락 단계부터 진행
+- meta.json: 재개에 필요한 입력값 (API 키는 저장하지 않음)
+- 결과를 전달한 뒤 remove()로 삭제, 중단된 채 남은 실행은 보관 기간이 지나면 새 실행을 만들 때 정리
+
+    ckpt = open_run("paper_kor", run_id, topic=topic)   # run_id=None이면 새 실행
+    title = cached(ckpt, "title", make_title, topic)     # 저장돼 있으면 불러옴
+"""
+import os
+import re
+import json
+import time
+import uuid
+import shutil
+import hashlib
+
+CHECKPOINT_DIR = os.environ.get("CHECKPOINT_DIR", "runs")
+RUN_ID_RE = re.compile(r"^[\w.-]+$")
+# 중단된 실행 보관 기간 (마지막 단계 저장 후 경과 시간)
+RETENTION_SECONDS = float(os.environ.get("CHECKPOINT_RETENTION_HOURS", 72)) * 3600
+
+
+def new_run_id(kind):
+    return f"{kind}_{time.strftime('%Y%m%d-%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+def _write_json(path, value):
+    tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class Checkpoint:
+    def __init__(self, run_id, root=CHECKPOINT_DIR):
+        # 외부 입력(폼)으로 들어오는 값이므로 폴더 밖 경로는 거부
+        if not RUN_ID_RE.match(run_id or "") or run_id in (".", ".."):
+            raise ValueError(f"잘못된 run_id: {run_id!r}")
+        self.run_id = run_id
+        self.dir = os.path.join(root, run_id)
+        os.makedirs(self.dir, exist_ok=True)
+
+    @classmethod
+    def open(cls, run_id, root=CHECKPOINT_DIR):
+        if not os.path.exists(os.path.join(root, run_id, "meta.json")):
+            raise FileNotFoundError(f"체크포인트가 없습니다: {run_id}")
+        return cls(run_id, root)
+
+    @property
+    def meta(self):
+        with open(os.path.join(self.dir, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    def path(self, name):
+        # 단계 이름 → 안전한 파일명 (한글/특수문자는 해시로 구분)
+        safe = re.sub(r"[^\w.-]", "_", name)
+        if safe != name:
+            safe += "-" + hashlib.sha1(name.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.dir, safe + ".json")
+
+    def has(self, name):
+        return os.path.exists(self.path(name))
+
+    def load(self, name):
+        with open(self.path(name), encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, name, value):
+        _write_json(self.path(name), value)
+        return value
+
+    def completed(self):
+        return sorted(f[:-5] for f in os.listdir(self.dir) if f.endswith(".json") and f != "meta.json")
+
+    def remove(self):
+        # 결과를 전달한 뒤 호출 (더 이상 재개할 필요 없음)
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def prune_runs(root=CHECKPOINT_DIR, max_age=RETENTION_SECONDS):
+    # 마지막 저장 후 max_age초가 지난 실행 폴더 삭제 (삭제한 개수 반환)
+    if not os.path.isdir(root):
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(root):
+        if entry.is_dir() and entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def open_run(kind, run_id=None, root=CHECKPOINT_DIR, **meta):
+    """
+    run_id가 없으면 새 실행, 있으면 그 실행을 이어서 사용
+    - meta는 처음 만들 때 저장, 재개 시에는 저장된 meta와 입력값이 같아야 함 (다르면 ValueError)
+    """
+    if run_id is None or not os.path.isdir(os.path.join(root, run_id)):
+        prune_runs(root)
+    ckpt = Checkpoint(run_id or new_run_id(kind), root)
+    meta_path = os.path.join(ckpt.dir, "meta.json")
+    # JSON으로 한 번 변환해 비교 (튜플 → 리스트 등)
+    meta = json.loads(json.dumps({"kind": kind, **meta}, ensure_ascii=False))
+    if not os.path.exists(meta_path):
+        _write_json(meta_path, meta)
+        return ckpt
+    stored = ckpt.meta
+    changed = sorted(k for k in set(stored) | set(meta) if stored.get(k) != meta.get(k))
+    if changed:
+        raise ValueError(f"'{ckpt.run_id}'의 저장된 입력값과 다릅니다 ({', '.join(changed)}). "
+                         "재개 ID 없이 새로 생성하세요.")
+    return ckpt
+
+def cached(checkpoint, name, func, *args, **kwargs):
+    # 저장된 결과가 있으면 사용, 없으면 실행 후 저장 (checkpoint=None이면 그냥 실행)
+    if checkpoint is None:
+        return func(*args, **kwargs)
+    if checkpoint.has(name):
+        return checkpoint.load(name)
+    return checkpoint.save(name, func(*args, **kwargs))
+
+async def cached_async(checkpoint, name, make):
+    # cached의 비동기 버전 (make는 코루틴을 만드는 함수)
+    if checkpoint is None:
+        return await make()
+    if checkpoint.has(name):
+        return checkpoint.load(name)
+    return checkpoint.save(name, await make())
@@ -1,41 +1,206 @@
 import os
 from pylatex import Document, Command, NoEscape
-import openai
-import subprocess
+import latex_build
 import ast
+import re
 import json
+import llm_client
+import ebook_export
+import checkpoint
+from concurrent.futures import ThreadPoolExecutor
 
-openai.api_key = None  # Flask에서 받은 API 키로 runtime에 세팅
-def ask_question(question):
-    response = openai.chat.completions.create(
-        model="gpt-4o-mini",  # 또는 gpt-3.5-turbo 등 최신 모델
-        messages=[
-            {"role": "system", "content": "당신은 친절한 한국어 작문 전문가입니다."},
-            {"role": "user", "content": question}
-        ],
-        temperature=0.7,
-        max_completion_tokens=1024,  # ⚠ 여기만 바뀜
-    )
-    return response.choices[0].message.content.strip()
+SYSTEM_PROMPT = "당신은 친절한 한국어 작문 전문가입니다."
+
+def ask_question(question, api_key=None):
+    return llm_client.ask(question, system=SYSTEM_PROMPT, api_key=api_key, max_tokens=1024)
 
-def blogposting(topic):
+def blogposting(topic, api_key=None):
     question = f"주제: [{topic}]\n500 단어 분량의 관련된 글을 작성하세요. 전문적이고 친절한 문체로 작성 할 것이고 반드시 한국어로 작성하세요."
-    return ask_question(question)
+    return ask_question(question, api_key)
+
+# 챕터 동시 생성 워커 수 (일시적 오류 재시도는 llm_client가 담당, 인증/요청 오류는 바로 실패)
+CHAPTER_WORKERS = int(os.environ.get("EBOOK_WORKERS", 8))
+
+def iter_chapters(topics, max_workers=CHAPTER_WORKERS, api_key=None, ckpt=None):
+    # 챕터를 병렬로 생성하되 입력 순서대로 하나씩 반환 (앞 챕터가 끝나는 대로 바로 사용 가능)
+    # ckpt가 있으면 챕터마다 저장, 이미 저장된 챕터는 다시 요청하지 않음
+    if not topics:
+        return
+    def chapter(topic):
+        return checkpoint.cached(ckpt, f"chapter:{topic}", blogposting, topic, api_key=api_key)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(topics))) as executor:
+        yield from executor.map(chapter, topics)
+
+def generate_chapters(topics, max_workers=CHAPTER_WORKERS, api_key=None, ckpt=None):
+    return list(iter_chapters(topics, max_workers, api_key, ckpt))
+
+# 소규모 전자책은 목차와 본문을 한 번의 요청으로 생성
+BATCH_MAX_CHAPTERS = 5
+BATCH_TOKENS_PER_CHAPTER = 700
+
+def ask_json(question, max_tokens=1024, api_key=None):
+    # JSON 모드 요청 (응답은 반드시 하나의 JSON 객체)
+    return llm_client.ask(
+        question,
+        system=SYSTEM_PROMPT + " 항상 JSON 객체 하나만 출력합니다.",
+        api_key=api_key,
+        max_tokens=max_tokens,
+        response_format={"type": "json_object"},
+    )
+
+def _scan(text):
+    # 문자열 밖 기준으로 열린 괄호 스택, 문자열 안에서 끝났는지, 마지막 쉼표 위치
+    stack, in_str, escaped, comma = [], False, False, None
+    for i, ch in enumerate(text):
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch in "[{":
+            stack.append("]" if ch == "[" else "}")
+        elif ch in "]}" and stack:
+            stack.pop()
+        elif ch == ",":
+            comma = i
+    return stack, in_str, comma
+
+def _close_brackets(text):
+    # 잘린 응답: 열린 문자열/괄호를 순서대로 닫음
+    stack, in_str, _ = _scan(text)
+    text = text + ('"' if in_str else "")
+    text = re.sub(r",\s*$", "", text)
+    return text + "".join(reversed(stack))
+
+def _trim_to_last_element(text):
+    # 잘린 응답: 마지막으로 완성된 요소(문자열 밖 마지막 쉼표 앞)까지만 남기고 닫음
+    # 키 중간에서 잘린 경우에도 앞의 완성된 항목은 살림
+    _, _, comma = _scan(text)
+    return None if comma is None else _close_brackets(text[:comma])
 
-def generate_latex(TOPIC1, num_list):
+def repair_json(text):
+    """
+    모델이 돌려준 JSON을 다시 요청하지 않고 로컬에서 복구
+    - 코드 블록(```json), 앞뒤 설명 문장, 스마트 따옴표, 끝 쉼표, 잘린 괄호 처리
+    - 문자열 중간에서 잘린 응답은 마지막으로 완성된 요소까지 되돌린 뒤 닫음
+    - 파이썬 리터럴(작은따옴표) 형식도 허용
+    """
+    text = re.sub(r"```(?:json)?", "", text).strip()
+    text = text.replace("“", '"').replace("”", '"').replace("‘", "'").replace("’", "'")
+    starts = [i for i in (text.find("["), text.find("{")) if i >= 0]
+    if not starts:
+        raise ValueError("JSON 형식을 찾을 수 없습니다.")
+    text = text[min(starts):]
+    end = max(text.rfind("]"), text.rfind("}"))
+    candidates = [text[:end + 1]] if end >= 0 else []
+    # 문자열 중간에서 잘렸으면(키 또는 값이 잘림) 완성된 요소까지 되돌린 것을 먼저 시도
+    repairs = [_trim_to_last_element(text), _close_brackets(text)]
+    candidates += repairs if _scan(text)[1] else repairs[::-1]
+    for candidate in filter(None, candidates):
+        candidate = re.sub(r",\s*([\]}])", r"\1", candidate)
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            pass
+        try:
+            return ast.literal_eval(candidate)
+        except (ValueError, SyntaxError):
+            pass
+    raise ValueError("JSON 복구 실패")
+
+def validate_outline(data, TOPIC1, num_list):
+    """
+    목차 검증 → [(제목, 본문 또는 None), ...] (정확히 num_list개)
+    - ["제목", ...] 또는 {"chapters": [{"title": ..., "body": ...}, ...]} 형식 허용
+    - 빈 제목/중복 제목 제거, 부족한 개수는 기본 제목으로 채움
+    """
+    if isinstance(data, dict):
+        data = data.get("chapters") or data.get("topics") or next(
+            (v for v in data.values() if isinstance(v, list)), [])
+    chapters, seen = [], set()
+    for item in data if isinstance(data, list) else []:
+        if isinstance(item, dict):
+            title, body = item.get("title"), item.get("body")
+        else:
+            title, body = item, None
+        title = str(title or "").strip()
+        if not title or title in seen:
+            continue
+        seen.add(title)
+        chapters.append((title, str(body).strip() if body else None))
+    for i in range(len(chapters), num_list):
+        chapters.append((TOPIC1 + f" 소주제 {i+1}", None))
+    return chapters[:num_list]
+
+def make_outline(TOPIC1, num_list, api_key=None):
     question2 = f"""
            '{TOPIC1}'와 관련된 서로 다른 {num_list}개의 소주제를 
-           반드시 JSON 배열 형식으로 출력하세요.
-           예: ["주제1", "주제2", "주제3"]
-           다른 설명, 문장, 글자, 쉼표 없이 배열만 반환하세요.
+           {{"chapters": ["주제1", "주제2", "주제3"]}} 형식의 JSON 객체로 출력하세요.
+           다른 설명 없이 JSON만 반환하세요.
+           """
+    try:
+        data = repair_json(ask_json(question2, api_key=api_key))
+    except ValueError:
+        data = []
+    return [title for title, _ in validate_outline(data, TOPIC1, num_list)]
+
+def _ask_book(TOPIC1, num_list, api_key=None):
+    question = f"""
+           '{TOPIC1}'에 관한 짧은 전자책을 작성하세요. 서로 다른 {num_list}개의 소주제마다
+           200 단어 분량의 본문을 전문적이고 친절한 한국어 문체로 작성하세요.
+           {{"chapters": [{{"title": "소주제", "body": "본문"}}, ...]}} 형식의 JSON 객체로만 출력하세요.
            """
-    content2 = ask_question(question2)
     try:
-        topic_list = json.loads(content2)
-    except:
-        topic_list = [TOPIC1 + f" 소주제 {i+1}" for i in range(num_list)]
+        data = repair_json(ask_json(question, BATCH_TOKENS_PER_CHAPTER * num_list + 200, api_key))
+    except ValueError:
+        data = []
+    return validate_outline(data, TOPIC1, num_list)
+
+def make_book(TOPIC1, num_list, api_key=None, ckpt=None):
+    """
+    목차 + 짧은 본문을 한 번에 요청 (소규모 전자책용)
+    - 본문이 빠진 챕터만 추가로 병렬 생성 → 왕복 1~2회
+    """
+    chapters = checkpoint.cached(ckpt, "book", _ask_book, TOPIC1, num_list, api_key)
+    missing = [title for title, body in chapters if not body]
+    filled = iter(generate_chapters(missing, api_key=api_key, ckpt=ckpt))
+    return [title for title, _ in chapters], [body or next(filled) for _, body in chapters]
 
-    to_list = topic_list[:num_list]
+def plan_book(TOPIC1, num_list, batched=None, api_key=None, ckpt=None):
+    # (소주제 목록, 본문 iterable) — batched=None이면 소규모 전자책만 일괄 생성
+    if batched is None:
+        batched = num_list <= BATCH_MAX_CHAPTERS
+    if batched:
+        return make_book(TOPIC1, num_list, api_key, ckpt)
+    to_list = checkpoint.cached(ckpt, "outline", make_outline, TOPIC1, num_list, api_key)
+    return to_list, iter_chapters(to_list, api_key=api_key, ckpt=ckpt)
+
+def generate_ebook(TOPIC1, num_list, filetype="epub", batched=False, api_key=None, run_id=None):
+    """
+    LaTeX 없이 EPUB 3 / 단일 HTML 전자책 생성 (파일 경로 반환)
+    - 챕터는 생성되는 대로 파일에 바로 기록
+    - 목차/챕터는 runs/<run_id>/에 저장 → 같은 run_id로 다시 호출하면 남은 챕터만 생성 (완성 후 삭제)
+    """
+    ckpt = checkpoint.open_run("ebook", run_id, TOPIC1=TOPIC1, num_list=num_list, filetype=filetype, batched=batched)
+    to_list, chapters = plan_book(TOPIC1, num_list, batched, api_key, ckpt)
+    out_folder = 'ebook'
+    os.makedirs(out_folder, exist_ok=True)
+    out_path = os.path.join(out_folder, f"{TOPIC1}.{filetype}")
+    writer = ebook_export.WRITERS[filetype]
+    writer(out_path, f"{TOPIC1} 전자책", f"{TOPIC1} 관련 소주제", to_list, chapters)
+    ckpt.remove()
+    return out_path
+
+def generate_latex(TOPIC1, num_list, batched=False, compile_pdf=True, api_key=None, run_id=None):
+    # 목차/챕터는 runs/<run_id>/에 저장 → 같은 run_id로 다시 호출하면 남은 챕터만 생성
+    # (tex 완성 후 삭제, compile_pdf면 컴파일까지 성공한 뒤 삭제)
+    ckpt = checkpoint.open_run("latex", run_id, TOPIC1=TOPIC1, num_list=num_list, batched=batched,
+                               compile_pdf=compile_pdf)
+    to_list, chapters = plan_book(TOPIC1, num_list, batched, api_key, ckpt)
     document = Document(documentclass='scrbook', document_options=['a5paper', 'pagesize', '10pt'])
     document.preamble.append(Command('usepackage', 'kotex'))
     
@@ -48,27 +213,30 @@ def generate_latex(TOPIC1, num_list):
     document.append(NoEscape(r"\tableofcontents"))
     document.append(Command('newpage'))
 
-    for ii, topic in enumerate(to_list):
-        sectiontitle = f"\\chapter{{{topic}}}"
-        document.append(NoEscape(sectiontitle))
-        content = blogposting(topic)
-        document.append(NoEscape(r"\large{" + content + "}"))
-        document.append(Command('newpage'))
-
     tex_folder = 'tex'
     os.makedirs(tex_folder, exist_ok=True)
     tex_path = os.path.join(tex_folder, f"{TOPIC1}.tex")
     pdf_path = tex_path.replace(".tex", ".pdf")
 
-    with open(tex_path, 'w', encoding='utf-8') as f:
-        f.write(document.dumps())
+    # 프리앰블/표지는 바로 기록, 챕터는 생성되는 대로 파일에 추가
+    with latex_build.StreamingDocument(tex_path, document) as stream:
+        for topic, content in zip(to_list, chapters):
+            stream.append(f"\\chapter{{{topic}}}%\n\\large{{{content}}}%\n\\newpage")
 
-    try:
-        subprocess.run(
-            ["pdflatex", "-interaction=nonstopmode", "-output-directory", tex_folder, tex_path],
-            check=True
-        )
-    except Exception as e:
-        print("PDF 변환 실패:", e)
+    if compile_pdf:
+        try:
+            latex_build.compile_pdf(tex_path, tex_folder)
+        except Exception as e:
+            # 체크포인트를 남겨 resume_book이 LLM 호출 없이 tex를 다시 만들고 컴파일하도록
+            print("PDF 변환 실패:", e)
+            return tex_path, pdf_path
+    ckpt.remove()
 
     return tex_path, pdf_path
+
+def resume_book(run_id, api_key=None):
+    # 저장된 입력값(meta.json)으로 중단된 전자책 생성 재개
+    meta = checkpoint.Checkpoint.open(run_id).meta
+    if meta["kind"] == "latex":
+        return generate_latex(meta["TOPIC1"], meta["num_list"], meta["batched"], meta["compile_pdf"], api_key, run_id)
+    return generate_ebook(meta["TOPIC1"], meta["num_list"], meta["filetype"], meta["batched"], api_key, run_id)
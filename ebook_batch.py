@@ -0,0 +1,181 @@
+"""
+주제 목록(CSV/JSONL)으로 전자책 일괄 생성
+
+    python ebook_batch.py topics.csv --filetype pdf --num-list 5 --books 4 --rpm 300 --tpm 150000 --concurrency 16
+
+- CSV: topic[,num_list] 열 (헤더가 없으면 첫 번째 열을 주제로 사용)
+- JSONL: {"topic": "...", "num_list": 5} 또는 "주제" 한 줄씩
+- 이미 결과 파일이 있는 주제는 건너뜀 (결과 파일은 완성된 뒤에만 최종 경로에 기록)
+- 책마다 고정 run_id(runs/batch_...)에 챕터를 저장 → 중단 후 다시 실행하면 남은 챕터만 생성
+- PDF 컴파일은 CPU 코어 수만큼의 별도 프로세스 풀에서 진행
+- .tex는 있는데 PDF만 없으면 (지난 컴파일 실패) 다시 생성하지 않고 컴파일만 진행
+"""
+import argparse
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import ebook
+import latex_build
+import llm_client
+
+FILETYPES = ("pdf", "tex", "epub", "html")
+
+
+def read_topics(path, num_list):
+    items = []
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in f:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                if isinstance(item, str):
+                    item = {"topic": item}
+                items.append(item)
+        else:
+            rows = [row for row in csv.reader(f) if row and row[0].strip()]
+            header = [c.strip().lower() for c in rows[0]] if rows else []
+            if "topic" in header:
+                items = [dict(zip(header, row)) for row in rows[1:]]
+            else:
+                items = [{"topic": row[0]} for row in rows]
+    return [{"topic": str(item["topic"]).strip(), "num_list": int(item.get("num_list") or num_list)}
+            for item in items]
+
+def output_path(topic, filetype):
+    if filetype in ("epub", "html"):
+        return os.path.join("ebook", f"{topic}.{filetype}")
+    return os.path.join("tex", f"{topic}.{filetype}")
+
+def book_run_id(topic, filetype, num_list, batched=False):
+    # 같은 주제/형식/챕터 수/생성 방식이면 같은 체크포인트를 사용
+    key = f"{topic}\0{num_list}\0{int(bool(batched))}"
+    return f"batch_{filetype}_{hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]}"
+
+def compile_job(tex_path):
+    # 프로세스 풀에서 실행 (소요 시간을 함께 반환)
+    t0 = time.perf_counter()
+    try:
+        latex_build.compile_pdf(tex_path, os.path.dirname(tex_path))
+        error = None
+    except Exception as e:
+        error = str(e)
+        # 오류가 난 컴파일의 PDF는 남기지 않음 (다음 실행에서 완료로 보고 건너뛰지 않도록)
+        pdf_path = os.path.splitext(tex_path)[0] + ".pdf"
+        if os.path.exists(pdf_path):
+            os.remove(pdf_path)
+    return time.perf_counter() - t0, error
+
+def build_book(item, filetype, batched, compile_pool, api_key=None):
+    topic = item["topic"]
+    row = {"topic": topic, "num_list": item["num_list"], "path": output_path(topic, filetype),
+           "run_id": book_run_id(topic, filetype, item["num_list"], batched)}
+    if os.path.exists(row["path"]):
+        row["status"] = "skipped"
+        return row, None
+    if filetype == "pdf":
+        # StreamingDocument는 완성된 뒤에만 최종 .tex를 남기므로 그대로 컴파일 (LLM 재호출 없음)
+        tex_path = os.path.splitext(row["path"])[0] + ".tex"
+        if os.path.exists(tex_path):
+            row.update(status="ok", generate_s=0.0, compile_only=True)
+            return row, compile_pool.submit(compile_job, tex_path)
+
+    t0 = time.perf_counter()
+    try:
+        if filetype in ("epub", "html"):
+            ebook.generate_ebook(topic, item["num_list"], filetype, batched=batched, api_key=api_key,
+                                 run_id=row["run_id"])
+        else:
+            tex_path, _ = ebook.generate_latex(topic, item["num_list"], batched=batched, compile_pdf=False,
+                                               api_key=api_key, run_id=row["run_id"])
+    except Exception as e:
+        row.update(status="error", error=str(e), generate_s=round(time.perf_counter() - t0, 3))
+        return row, None
+    row.update(status="ok", generate_s=round(time.perf_counter() - t0, 3))
+
+    future = compile_pool.submit(compile_job, tex_path) if filetype == "pdf" else None
+    return row, future
+
+def percentile(values, q):
+    return round(float(np.percentile(values, q)), 3) if values else None
+
+def run_batch(items, filetype="pdf", books=4, batched=False, compile_workers=None, api_key=None):
+    """
+    여러 전자책을 동시에 생성하고 주제별 결과와 요약 보고서를 반환
+    - books: 동시에 만드는 전자책 수 (LLM 요청 한도는 llm_client.set_limits로 전역 적용)
+    - 생성이 끝난 책은 바로 컴파일 풀로 넘기고 다음 책을 생성
+    """
+    t0 = time.perf_counter()
+    compile_pool = None
+    if filetype == "pdf":
+        # 작업은 LLM 스레드가 도는 중에 제출되므로 fork 대신 spawn (스레드 중 fork는 잠금 교착 위험)
+        compile_pool = ProcessPoolExecutor(max_workers=compile_workers or os.cpu_count(),
+                                           mp_context=multiprocessing.get_context("spawn"))
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, books)) as executor:
+            results = list(executor.map(lambda item: build_book(item, filetype, batched, compile_pool, api_key), items))
+        rows = []
+        for row, future in results:
+            if future is not None:
+                compile_s, error = future.result()
+                row["compile_s"] = round(compile_s, 3)
+                if error or not os.path.exists(row["path"]):
+                    row.update(status="error", error=error or "PDF 생성 실패")
+            rows.append(row)
+    finally:
+        if compile_pool is not None:
+            compile_pool.shutdown()
+
+    elapsed = time.perf_counter() - t0
+    done = [r for r in rows if r["status"] == "ok"]
+    latencies = [r["generate_s"] + r.get("compile_s", 0) for r in done]
+    summary = {
+        "filetype": filetype,
+        "books": len(rows),
+        "ok": len(done),
+        "skipped": sum(r["status"] == "skipped" for r in rows),
+        "errors": sum(r["status"] == "error" for r in rows),
+        "elapsed_s": round(elapsed, 3),
+        "books_per_min": round(len(done) / elapsed * 60, 2) if elapsed > 0 else None,
+        "latency_p50_s": percentile(latencies, 50),
+        "latency_p95_s": percentile(latencies, 95),
+        "generate_p50_s": percentile([r["generate_s"] for r in done], 50),
+        "compile_p50_s": percentile([r["compile_s"] for r in done if "compile_s" in r], 50),
+    }
+    return {"summary": summary, "books": rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("topics", help="주제 목록 파일 (.csv / .jsonl)")
+    parser.add_argument("--filetype", choices=FILETYPES, default="pdf")
+    parser.add_argument("--num-list", type=int, default=5, help="파일에 없을 때 사용할 하위 주제 개수")
+    parser.add_argument("--books", type=int, default=4, help="동시에 생성할 전자책 수")
+    parser.add_argument("--rpm", type=float, default=None, help="전체 분당 LLM 요청 수 상한")
+    parser.add_argument("--tpm", type=float, default=None, help="전체 분당 LLM 토큰 수 상한")
+    parser.add_argument("--concurrency", type=int, default=None, help="전체 동시 LLM 요청 수 상한")
+    parser.add_argument("--compile-workers", type=int, default=None, help="PDF 컴파일 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--batched", action="store_true", help="목차와 본문을 한 번에 요청 (소규모 전자책)")
+    parser.add_argument("--apikey", default=os.environ.get("OPENAI_API_KEY"), help="기본: OPENAI_API_KEY")
+    parser.add_argument("--report", default="ebook_batch_report.json", help="처리량/지연 시간 보고서 경로")
+    args = parser.parse_args()
+
+    if not args.apikey:
+        parser.error("API 키가 필요합니다 (--apikey 또는 OPENAI_API_KEY).")
+    llm_client.set_limits(rpm=args.rpm, tpm=args.tpm, concurrency=args.concurrency)
+
+    items = read_topics(args.topics, args.num_list)
+    report = run_batch(items, args.filetype, args.books, args.batched, args.compile_workers,
+                       args.apikey)
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report["summary"], ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
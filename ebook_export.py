@@ -0,0 +1,138 @@
+import os
+import html
+import functools
+import uuid
+import zipfile
+from datetime import datetime, timezone
+
+# LaTeX 없이 바로 읽을 수 있는 전자책 출력 (EPUB 3, 단일 HTML)
+STYLE = """
+body { font-family: serif; line-height: 1.7; margin: 0 auto; max-width: 40em; padding: 0 1em; }
+h1, h2 { line-height: 1.3; }
+.titlepage { text-align: center; margin: 4em 0; }
+.titlepage .subtitle { font-size: 1.2em; }
+nav ol { padding-left: 1.5em; }
+section.chapter { page-break-before: always; }
+""".strip()
+
+CONTAINER_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>
+"""
+
+XHTML_PAGE = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="ko" xml:lang="ko">
+<head><meta charset="UTF-8"/><title>{title}</title><link rel="stylesheet" href="style.css"/></head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def _atomic(write):
+    # 임시 파일에 쓴 뒤 교체 → 중간에 실패해도 최종 경로에는 완성된 파일만 남음
+    @functools.wraps(write)
+    def wrapper(path, *args, **kwargs):
+        tmp_path = path + ".tmp"
+        try:
+            write(tmp_path, *args, **kwargs)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return path
+    return wrapper
+
+def paragraphs(text):
+    # 빈 줄 기준 문단 → <p>, 문단 내 줄바꿈은 <br/>
+    blocks = [b.strip() for b in text.replace("\r\n", "\n").split("\n\n")]
+    return "\n".join(
+        "<p>" + "<br/>".join(html.escape(line) for line in b.split("\n")) + "</p>" for b in blocks if b
+    )
+
+def title_html(title, subtitle):
+    return (f'<div class="titlepage"><h1>{html.escape(title)}</h1>'
+            f'<p class="subtitle">{html.escape(subtitle)}</p></div>')
+
+def toc_html(topics, href):
+    items = "\n".join(f'<li><a href="{href(i)}">{html.escape(t)}</a></li>' for i, t in enumerate(topics))
+    return f'<nav epub:type="toc" id="toc"><h2>목차</h2>\n<ol>\n{items}\n</ol>\n</nav>'
+
+def chapter_html(index, topic, content):
+    return (f'<section class="chapter" id="ch{index + 1}"><h2>{html.escape(topic)}</h2>\n'
+            f"{paragraphs(content)}\n</section>")
+
+@_atomic
+def write_html(path, title, subtitle, topics, chapters):
+    """
+    단일 HTML 파일로 저장
+    - chapters: topics 순서의 본문 iterable (생성되는 대로 파일에 바로 기록)
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'<!DOCTYPE html>\n<html lang="ko">\n<head>\n<meta charset="UTF-8">\n'
+                f"<title>{html.escape(title)}</title>\n<style>\n{STYLE}\n</style>\n</head>\n<body>\n")
+        f.write(title_html(title, subtitle) + "\n")
+        f.write(toc_html(topics, lambda i: f"#ch{i + 1}").replace(' epub:type="toc"', "") + "\n")
+        for i, (topic, content) in enumerate(zip(topics, chapters)):
+            f.write(chapter_html(i, topic, content) + "\n")
+            f.flush()
+        f.write("</body>\n</html>\n")
+    return path
+
+def _package_opf(book_id, title, count):
+    modified = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    items = "\n".join(
+        f'    <item id="ch{i}" href="ch{i}.xhtml" media-type="application/xhtml+xml"/>' for i in range(1, count + 1)
+    )
+    spine = "\n".join(f'    <itemref idref="ch{i}"/>' for i in range(1, count + 1))
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id" xml:lang="ko">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <dc:identifier id="book-id">urn:uuid:{book_id}</dc:identifier>
+    <dc:title>{html.escape(title)}</dc:title>
+    <dc:language>ko</dc:language>
+    <meta property="dcterms:modified">{modified}</meta>
+  </metadata>
+  <manifest>
+    <item id="style" href="style.css" media-type="text/css"/>
+    <item id="title" href="title.xhtml" media-type="application/xhtml+xml"/>
+    <item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>
+{items}
+  </manifest>
+  <spine>
+    <itemref idref="title"/>
+    <itemref idref="nav"/>
+{spine}
+  </spine>
+</package>
+"""
+
+@_atomic
+def write_epub(path, title, subtitle, topics, chapters):
+    """
+    EPUB 3 파일로 저장
+    - chapters: topics 순서의 본문 iterable (챕터마다 zip 항목으로 바로 기록)
+    - mimetype은 규격상 첫 항목, 무압축
+    """
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(zipfile.ZipInfo("mimetype"), "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        zf.writestr("META-INF/container.xml", CONTAINER_XML)
+        zf.writestr("OEBPS/style.css", STYLE)
+        zf.writestr("OEBPS/title.xhtml",
+                    XHTML_PAGE.format(title=html.escape(title), body=title_html(title, subtitle)))
+        zf.writestr("OEBPS/nav.xhtml",
+                    XHTML_PAGE.format(title="목차", body=toc_html(topics, lambda i: f"ch{i + 1}.xhtml")))
+        count = 0
+        for i, (topic, content) in enumerate(zip(topics, chapters)):
+            zf.writestr(f"OEBPS/ch{i + 1}.xhtml",
+                        XHTML_PAGE.format(title=html.escape(topic), body=chapter_html(i, topic, content)))
+            count += 1
+        zf.writestr("OEBPS/content.opf", _package_opf(uuid.uuid4(), title, count))
+    return path
+
+WRITERS = {"epub": write_epub, "html": write_html}
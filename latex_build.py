@@ -0,0 +1,312 @@
+import os
+import re
+import sys
+import shutil
+import hashlib
+import threading
+import subprocess
+
+try:
+    import fcntl  # 여러 프로세스가 같은 포맷을 동시에 만들지 않도록 (POSIX)
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# 사전 컴파일 포맷(.fmt) 보관 위치
+ENGINE = "pdflatex"
+FMT_DIR = os.path.join("tex", ".fmt")
+BEGIN_DOCUMENT = r"\begin{document}"
+
+# 빌드 캐시 (tex 소스 + 참조 파일 해시 → PDF)
+CACHE_DIR = os.path.join("tex", ".cache")
+MAX_CACHED_PDFS = 64
+MAX_PASSES = 4
+AUX_EXTENSIONS = (".aux", ".toc", ".lof", ".lot", ".bbl")
+RERUN_MARKERS = ("Rerun to get", "Label(s) may have changed")
+# 포맷 파일 자체가 맞지 않을 때의 메시지 (TeX 배포판 업데이트, 다른 엔진/버전으로 생성 등)
+FORMAT_ERROR_MARKERS = ("Fatal format file error", "I can't find the format file",
+                        "made by different executable version", "was written by")
+GRAPHICS_EXTENSIONS = (".pdf", ".png", ".jpg", ".jpeg")
+GRAPHICS_RE = re.compile(r"\\includegraphics\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}")
+BIBLIOGRAPHY_RE = re.compile(r"\\bibliography\s*\{([^}]+)\}")
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def split_preamble(source):
+    # \begin{document} 기준으로 (프리앰블, 본문) 분리
+    idx = source.find(BEGIN_DOCUMENT)
+    if idx < 0:
+        raise ValueError("\\begin{document}가 없는 문서입니다.")
+    return source[:idx], source[idx:]
+
+def format_name(preamble, engine=ENGINE):
+    # 프리앰블 내용이 바뀌면 이름도 바뀜 → 자동으로 새 포맷 생성
+    digest = hashlib.sha1(f"{engine}\0{preamble}".encode("utf-8")).hexdigest()[:16]
+    return f"preamble_{digest}"
+
+def _lock_for(name):
+    with _locks_guard:
+        return _locks.setdefault(name, threading.Lock())
+
+def ensure_format(preamble, fmt_dir=FMT_DIR, engine=ENGINE):
+    """
+    프리앰블을 덤프한 .fmt 파일을 만들고 이름을 반환 (이미 있으면 재사용)
+    - mylatexformat: \\begin{document} 이전까지(kotex 등 패키지 로딩)를 포맷에 저장
+    """
+    name = format_name(preamble, engine)
+    fmt_path = os.path.join(fmt_dir, name + ".fmt")
+    if os.path.exists(fmt_path):
+        return name
+
+    os.makedirs(fmt_dir, exist_ok=True)
+    with _lock_for(name), open(os.path.join(fmt_dir, name + ".lock"), "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        if os.path.exists(fmt_path):
+            return name
+        with open(os.path.join(fmt_dir, name + ".tex"), "w", encoding="utf-8") as f:
+            f.write(preamble + BEGIN_DOCUMENT + "\n\\end{document}\n")
+        subprocess.run(
+            [engine, "-ini", "-interaction=nonstopmode", f"-jobname={name}",
+             f"&{engine}", "mylatexformat.ltx", name + ".tex"],
+            cwd=fmt_dir, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        if not os.path.exists(fmt_path):
+            raise RuntimeError(f"포맷 파일이 생성되지 않았습니다: {fmt_path}")
+    return name
+
+def _run(cmd, env=None, cwd=None):
+    return subprocess.run(cmd, env=env, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def _file_digest(path):
+    if not os.path.isfile(path):
+        return None
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _resolve(name, search_dirs, extensions):
+    for base in search_dirs:
+        for ext in ("",) + extensions:
+            path = os.path.join(base, name + ext)
+            if os.path.isfile(path):
+                return path
+    return None
+
+def find_assets(source, tex_dir="."):
+    """
+    문서가 참조하는 외부 파일 목록 (그림, .bib)
+    - pdflatex는 작업 디렉터리 기준, 문서 폴더 기준 순서로 찾음
+    """
+    search_dirs = [".", tex_dir]
+    assets = []
+    for name in GRAPHICS_RE.findall(source):
+        path = _resolve(name.strip(), search_dirs, GRAPHICS_EXTENSIONS)
+        if path:
+            assets.append(path)
+    for names in BIBLIOGRAPHY_RE.findall(source):
+        for name in names.split(","):
+            path = _resolve(name.strip(), search_dirs, (".bib",))
+            if path:
+                assets.append(path)
+    return sorted(set(assets))
+
+def build_key(source, assets, engine=ENGINE):
+    # tex 소스 + 참조 파일 내용의 해시 → 같은 입력이면 같은 PDF
+    h = hashlib.sha1(f"{engine}\0".encode("utf-8"))
+    h.update(source.encode("utf-8"))
+    for path in assets:
+        h.update(f"\0{os.path.basename(path)}\0{_file_digest(path)}".encode("utf-8"))
+    return h.hexdigest()
+
+def _snapshot(jobbase):
+    # 다음 패스가 읽게 될 보조 파일 상태 (목차, 상호참조, 참고문헌)
+    return tuple(_file_digest(jobbase + ext) for ext in AUX_EXTENSIONS)
+
+def _needs_rerun(jobbase):
+    try:
+        with open(jobbase + ".log", encoding="utf-8", errors="ignore") as f:
+            log = f.read()
+    except OSError:
+        return False
+    return any(marker in log for marker in RERUN_MARKERS)
+
+def _bib_state(jobbase, bib_files):
+    # \citation, \bibdata, \bibstyle 줄 + .bib 내용이 같으면 bibtex 재실행 불필요
+    try:
+        with open(jobbase + ".aux", encoding="utf-8", errors="ignore") as f:
+            lines = [l for l in f if l.startswith(("\\citation", "\\bibdata", "\\bibstyle"))]
+    except OSError:
+        return None
+    h = hashlib.sha1("".join(lines).encode("utf-8"))
+    for path in bib_files:
+        h.update(str(_file_digest(path)).encode("utf-8"))
+    return h.hexdigest()
+
+def _first_pass(source, tex_path, base, pdf_path, use_format, fmt_dir, engine):
+    # 사전 컴파일 포맷으로 첫 패스를 시도하고, 이후 패스에 쓸 명령과 환경을 반환
+    if use_format:
+        try:
+            preamble, _ = split_preamble(source)
+            name = ensure_format(preamble, fmt_dir, engine)
+        except (OSError, ValueError, RuntimeError, subprocess.SubprocessError) as e:
+            print("포맷 파일 생성 실패, 일반 컴파일로 진행:", e)
+        else:
+            # TEXFORMATS 끝의 구분자: 기본 검색 경로도 함께 사용
+            env = dict(os.environ, TEXFORMATS=os.path.abspath(fmt_dir) + os.pathsep)
+            cmd = base + [f"-fmt={name}", tex_path]
+            before = os.path.getmtime(pdf_path) if os.path.exists(pdf_path) else None
+            result = subprocess.run(cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            if os.path.exists(pdf_path) and os.path.getmtime(pdf_path) != before:
+                return cmd, env, result
+            output = result.stdout.decode("utf-8", errors="ignore")
+            if not any(marker in output for marker in FORMAT_ERROR_MARKERS):
+                # 문서 자체의 오류 → 포맷은 그대로 두고 결과 반환 (오류는 compile_pdf에서 처리)
+                return cmd, env, result
+            # 포맷이 맞지 않는 경우에만 삭제 후 일반 컴파일
+            print("포맷 파일 사용 실패, 일반 컴파일로 진행:", name)
+            try:
+                os.remove(os.path.join(fmt_dir, name + ".fmt"))
+            except OSError:
+                pass
+    cmd = base + [tex_path]
+    return cmd, None, _run(cmd)
+
+def _prune_cache(cache_dir, keep=MAX_CACHED_PDFS):
+    # 최근 사용 순으로 keep개만 유지
+    entries = [e for e in os.scandir(cache_dir) if e.name.endswith(".pdf")]
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for entry in entries[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+def compile_pdf(tex_path, output_dir=None, use_format=False, fmt_dir=FMT_DIR, engine=ENGINE,
+                cache_dir=CACHE_DIR):
+    """
+    tex → pdf 컴파일 (PDF 경로 반환, 실패 시 CalledProcessError)
+    - 소스와 참조 파일이 이전 빌드와 같으면 캐시된 PDF를 그대로 사용 (cache_dir=None이면 끔)
+    - 필요한 패스만 실행: 목차/참조가 그대로면 pdflatex 1회,
+      인용이 바뀌었을 때만 bibtex, 보조 파일이 안정될 때까지만 재실행
+    - use_format: 프리앰블별 .fmt를 사용해 kotex 등 패키지 로딩 시간 절약 (기본 꺼짐)
+      benchmarks/bench_latex.py로 실제 TeX 환경에서 시간과 PDF 동일성을 확인한 뒤에만 켤 것
+    """
+    tex_dir = os.path.dirname(tex_path) or "."
+    output_dir = output_dir or tex_dir
+    jobbase = os.path.join(output_dir, os.path.splitext(os.path.basename(tex_path))[0])
+    pdf_path = jobbase + ".pdf"
+
+    with open(tex_path, encoding="utf-8") as f:
+        source = f.read()
+    assets = find_assets(source, tex_dir)
+
+    cached = None
+    if cache_dir:
+        cached = os.path.join(cache_dir, build_key(source, assets, engine) + ".pdf")
+        if os.path.exists(cached):
+            shutil.copyfile(cached, pdf_path)
+            os.utime(cached)
+            return pdf_path
+
+    base = [engine, "-interaction=nonstopmode", "-output-directory", output_dir]
+    before = _snapshot(jobbase)
+    cmd, env, result = _first_pass(source, tex_path, base, pdf_path, use_format, fmt_dir, engine)
+
+    bib_files = [p for p in assets if p.endswith(".bib")]
+    if BIBLIOGRAPHY_RE.search(source):
+        state = _bib_state(jobbase, bib_files)
+        state_path = jobbase + ".bibstate"
+        try:
+            with open(state_path, encoding="utf-8") as f:
+                previous = f.read()
+        except OSError:
+            previous = None
+        if state is not None and (state != previous or not os.path.exists(jobbase + ".bbl")):
+            bib_env = dict(os.environ, BIBINPUTS=os.path.abspath(tex_dir) + os.pathsep)
+            _run(["bibtex", os.path.basename(jobbase)], env=bib_env, cwd=output_dir)
+            with open(state_path, "w", encoding="utf-8") as f:
+                f.write(state)
+
+    # 직전 패스가 읽은 보조 파일과 지금 상태가 같으면 결과가 확정된 것
+    for _ in range(MAX_PASSES - 1):
+        after = _snapshot(jobbase)
+        if after == before and not _needs_rerun(jobbase):
+            break
+        before = after
+        result = _run(cmd, env=env)
+
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, result.args)
+
+    if cached:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cached}.{os.getpid()}.tmp"
+        shutil.copyfile(pdf_path, tmp_path)
+        os.replace(tmp_path, cached)
+        _prune_cache(cache_dir)
+    return pdf_path
+
+
+class StreamingDocument:
+    """
+    pylatex Document의 프리앰블과 앞부분(표지, 목차)을 바로 기록하고,
+    본문은 생성되는 대로 파일 끝에 이어 씀
+    - 전체 문서를 메모리에 모아 dumps()하지 않음
+    - 작성 중에는 <path>.tmp에 쓰고, 정상 종료 시에만 path로 교체 (path가 있으면 완성된 문서)
+    - 덧붙일 때마다 flush/fsync → 중간에 실패하면 그때까지의 내용을 <이름>_partial.tex로 남김
+    - snapshot(): 지금까지의 내용으로 컴파일 가능한 사본 생성 (미리 보기용)
+    """
+    END = "\\end{document}"
+
+    def __init__(self, path, document):
+        head = document.dumps()
+        self.path = path
+        self.tmp_path = path + ".tmp"
+        self.count = 0
+        self._file = open(self.tmp_path, "w", encoding="utf-8")
+        self._write(head[:head.rfind(self.END)])
+
+    def _write(self, text):
+        self._file.write(text)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def append(self, latex):
+        self._write(latex + "%\n")
+        self.count += 1
+
+    def partial_path(self):
+        stem, ext = os.path.splitext(self.path)
+        return f"{stem}_partial{ext}"
+
+    def snapshot(self, path=None):
+        path = path or self.partial_path()
+        shutil.copyfile(self.tmp_path, path)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(self.END + "\n")
+        return path
+
+    def close(self, complete=True):
+        # 예외로 끝나도 \end{document}를 써서 부분 결과를 컴파일 가능하게 유지
+        if not self._file.closed:
+            self._write(self.END + "\n")
+            self._file.close()
+            os.replace(self.tmp_path, self.path if complete else self.partial_path())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.close(complete=exc_type is None)
+
+
+if __name__ == "__main__":
+    # 사용법: python latex_build.py tex/책.tex ...  → 각 문서 프리앰블의 포맷을 미리 생성
+    # compile_pdf(use_format=True)로 컴파일할 때만 사용됨 (논문 생성기는 PDF를 컴파일하지 않음)
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as f:
+            print(path, "→", ensure_format(split_preamble(f.read())[0]))
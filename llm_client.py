@@ -0,0 +1,276 @@
+"""
+공용 LLM 클라이언트
+- API 키별 OpenAI 클라이언트 풀 (HTTP keep-alive 연결 유지, LRU + 유휴 만료)
+  → 전역 openai.api_key를 바꾸지 않으므로 여러 스레드/사용자가 동시에 호출해도 안전
+- 재시도 가능한 오류(429, 시간 초과, 연결 오류, 5xx)는 지터를 둔 지수 백오프로 재시도
+- 프로세스 전체 분당 요청 수(RPM) / 분당 토큰 수(TPM)를 토큰 버킷으로 제한
+  → 여러 스레드가 동시에 호출해도 한도를 넘지 않고 순서대로 대기
+- AsyncSession: AsyncOpenAI 기반 비동기 호출 (같은 한도/재시도 규칙, 세마포어로 동시 요청 수 제한)
+"""
+import os
+import time
+import asyncio
+import random
+import hashlib
+import threading
+from collections import OrderedDict
+import openai
+
+MODEL = "gpt-4o-mini"
+RPM_LIMIT = float(os.environ.get("LLM_RPM", 500))
+TPM_LIMIT = float(os.environ.get("LLM_TPM", 200000))
+MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", 5))
+BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+REQUEST_TIMEOUT = float(os.environ.get("LLM_TIMEOUT", 120))
+RETRYABLE_STATUS = (408, 409, 429)
+MAX_CLIENTS = int(os.environ.get("LLM_MAX_CLIENTS", 32))
+CLIENT_IDLE_SECONDS = float(os.environ.get("LLM_CLIENT_IDLE", 600))
+
+
+class TokenBucket:
+    """
+    분당 rate만큼 채워지는 토큰 버킷 (용량: 1분치)
+    - acquire: 토큰이 모자라면 채워질 때까지 대기
+    - adjust: 실제 사용량과 추정치의 차이를 반영 (음수면 반환, 양수면 추가 차감)
+    """
+
+    def __init__(self, rate_per_minute):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, amount=1.0):
+        # 성공하면 0, 아니면 기다려야 할 시간(초) — 용량보다 큰 요청은 가득 찼을 때 통과
+        amount = min(amount, self.capacity)
+        with self.lock:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.rate
+
+    def acquire(self, amount=1.0):
+        while True:
+            wait = self.try_acquire(amount)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, amount=1.0):
+        while True:
+            wait = self.try_acquire(amount)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def adjust(self, amount):
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class ClientPool:
+    """
+    API 키별 OpenAI 클라이언트 LRU 풀
+    - 최대 max_clients개 유지, idle_seconds 동안 쓰이지 않은 클라이언트는 제거
+    - 키 원문 대신 해시로 보관
+    - 제거된 클라이언트는 참조가 사라지면(진행 중인 요청이 끝나면) 연결이 정리됨
+    """
+
+    def __init__(self, max_clients=MAX_CLIENTS, idle_seconds=CLIENT_IDLE_SECONDS):
+        self.max_clients = max_clients
+        self.idle_seconds = idle_seconds
+        self._clients = OrderedDict()  # 키 해시 → (클라이언트, 마지막 사용 시각)
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        while self._clients:
+            key, (_, used) = next(iter(self._clients.items()))
+            if now - used < self.idle_seconds:
+                break
+            del self._clients[key]
+
+    def get(self, api_key):
+        if not api_key:
+            raise ValueError("OpenAI API 키가 필요합니다.")
+        key = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._clients.pop(key, None)
+            client = entry[0] if entry else openai.OpenAI(api_key=api_key, max_retries=0, timeout=REQUEST_TIMEOUT)
+            self._clients[key] = (client, now)
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+            return client
+
+    def __len__(self):
+        return len(self._clients)
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+
+client_pool = ClientPool()
+_request_bucket = TokenBucket(RPM_LIMIT)
+_token_bucket = TokenBucket(TPM_LIMIT)
+_call_slots = None
+
+
+def set_limits(rpm=None, tpm=None, concurrency=None):
+    # 프로세스 전체 한도 변경 (None이면 해당 항목은 그대로, concurrency=0이면 동시 요청 제한 해제)
+    global _request_bucket, _token_bucket, _call_slots
+    if rpm:
+        _request_bucket = TokenBucket(rpm)
+    if tpm:
+        _token_bucket = TokenBucket(tpm)
+    if concurrency is not None:
+        _call_slots = threading.BoundedSemaphore(concurrency) if concurrency else None
+
+def get_client(api_key=None):
+    # 같은 키는 같은 클라이언트(연결 풀) 재사용
+    # 키가 없을 때 서버의 OPENAI_API_KEY로 대신 요청하지 않음 (CLI는 ebook_batch처럼 직접 읽어서 전달)
+    return client_pool.get(api_key)
+
+def is_retryable(error):
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS or error.status_code >= 500
+    return False
+
+def _retry_delay(error, attempt):
+    # 서버가 Retry-After를 주면 따르고, 아니면 full jitter 지수 백오프
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return min(MAX_DELAY, float(retry_after))
+    except (TypeError, ValueError):
+        return random.uniform(0, min(MAX_DELAY, BASE_DELAY * 2 ** attempt))
+
+def estimate_tokens(messages, max_tokens):
+    # 한국어는 대략 글자당 1토큰 이하 → 보수적으로 추정 후 응답의 usage로 보정
+    return sum(len(m.get("content") or "") for m in messages) + max_tokens
+
+def call_with_retry(func, retries=MAX_RETRIES):
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except openai.OpenAIError as e:
+            if attempt == retries or not is_retryable(e):
+                raise
+            delay = _retry_delay(e, attempt)
+            print(f"LLM 요청 재시도 ({attempt + 1}/{retries}, {delay:.1f}초 후): {type(e).__name__}")
+            time.sleep(delay)
+
+def _limited(func, tokens):
+    slots = _call_slots
+    if slots is not None:
+        slots.acquire()
+    try:
+        _request_bucket.acquire(1)
+        _token_bucket.acquire(tokens)
+        return func()
+    finally:
+        if slots is not None:
+            slots.release()
+
+def chat(messages, api_key=None, model=MODEL, temperature=0.7, max_tokens=1024, **kwargs):
+    """채팅 요청 → 응답 텍스트 (한도 대기 + 재시도 포함)"""
+    client = get_client(api_key)
+    estimate = estimate_tokens(messages, max_tokens)
+
+    def request():
+        return _limited(lambda: client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_completion_tokens=max_tokens,
+            **kwargs,
+        ), estimate)
+
+    response = call_with_retry(request)
+    usage = getattr(response, "usage", None)
+    if usage is not None and usage.total_tokens:
+        _token_bucket.adjust(usage.total_tokens - estimate)
+    return response.choices[0].message.content.strip()
+
+def ask(question, system=None, **kwargs):
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.append({"role": "user", "content": question})
+    return chat(messages, **kwargs)
+
+def generate_image(prompt, api_key=None, model="dall-e-3", size="1024x1024"):
+    """이미지 생성 → URL (없으면 None)"""
+    client = get_client(api_key)
+    response = call_with_retry(lambda: _limited(
+        lambda: client.images.generate(model=model, prompt=prompt, size=size), 0))
+    return response.data[0].url if response.data and response.data[0].url else None
+
+
+class AsyncSession:
+    """
+    AsyncOpenAI 세션 (이벤트 루프 하나에서만 사용)
+    - max_concurrency: 동시에 보내는 요청 수 상한
+    - RPM/TPM 한도와 재시도 규칙은 동기 호출과 같은 버킷을 공유
+
+        async with AsyncSession(api_key) as session:
+            text = await session.ask("...")
+    """
+
+    def __init__(self, api_key=None, max_concurrency=8):
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.client = None
+
+    async def __aenter__(self):
+        if not self.api_key:
+            raise ValueError("OpenAI API 키가 필요합니다.")
+        self.client = openai.AsyncOpenAI(api_key=self.api_key, max_retries=0, timeout=REQUEST_TIMEOUT)
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.close()
+
+    async def _request(self, func, tokens, retries=MAX_RETRIES):
+        for attempt in range(retries + 1):
+            try:
+                async with self.semaphore:
+                    await _request_bucket.acquire_async(1)
+                    await _token_bucket.acquire_async(tokens)
+                    return await func()
+            except openai.OpenAIError as e:
+                if attempt == retries or not is_retryable(e):
+                    raise
+                delay = _retry_delay(e, attempt)
+                print(f"LLM 요청 재시도 ({attempt + 1}/{retries}, {delay:.1f}초 후): {type(e).__name__}")
+                await asyncio.sleep(delay)
+
+    async def chat(self, messages, model=MODEL, temperature=0.7, max_tokens=1024, **kwargs):
+        estimate = estimate_tokens(messages, max_tokens)
+        response = await self._request(lambda: self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_completion_tokens=max_tokens,
+            **kwargs,
+        ), estimate)
+        usage = getattr(response, "usage", None)
+        if usage is not None and usage.total_tokens:
+            _token_bucket.adjust(usage.total_tokens - estimate)
+        return response.choices[0].message.content.strip()
+
+    async def ask(self, question, system=None, **kwargs):
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": question})
+        return await self.chat(messages, **kwargs)
@@ -0,0 +1,12 @@
+from .catalog import MenuCatalog, DATA_PATH, load_catalog, get_catalog
+from .menu import optimize_menu, solve_menu, summarize_plan, MenuInfeasibleError
+from .model import MenuModel, get_model
+from .solvers import SolveResult, solve_milp, default_backend
+from .batch import solve_batch, solve_scenario
+from .cache import ResultCache, result_cache
+from .planner import plan_week
+from .relax import approximate_menu, get_relaxed
+from .sweep import sweep_targets, target_range
+from .nutrition import NutritionStore, optimize_nutrition, parse_constraint
+from .procurement import plan_procurement
+from .catalog import add_dish, update_dish, retire_dish, on_publish
@@ -0,0 +1,77 @@
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from .catalog import get_catalog, DATA_PATH
+from .model import get_model
+from .menu import summarize_plan
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker(path):
+    # 워커마다 카탈로그/모델을 한 번만 준비 (fork 환경에서는 부모의 캐시를 그대로 공유)
+    get_model(get_catalog(path))
+
+
+def get_pool(path=DATA_PATH, max_workers=None):
+    """배치 풀이용 프로세스 풀 (프로세스당 하나, 처음 호출 시 생성)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            get_catalog(path)  # fork 전에 부모에서 먼저 로드
+            _pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(path,))
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+
+def parse_scenario(item):
+    """{"cal", "protein", "budget"} 또는 [cal, protein, budget] → (cal, protein, budget)"""
+    if isinstance(item, dict):
+        cal, protein, budget = item["cal"], item["protein"], item["budget"]
+    else:
+        cal, protein, budget = item
+    return int(cal), int(protein), float(budget)
+
+
+def solve_scenario(index, item, path=DATA_PATH, backend=None, time_limit=None, mip_gap=None):
+    """시나리오 1건 풀이 → JSON으로 보낼 dict (오류도 dict로 반환)"""
+    try:
+        cal, protein, budget = parse_scenario(item)
+    except (KeyError, TypeError, ValueError) as e:
+        return {"index": index, "status": "error", "error": f"잘못된 시나리오: {e!r}"}
+
+    row = {"index": index, "cal": cal, "protein": protein, "budget": budget}
+    try:
+        catalog = get_catalog(path)
+        res = get_model(catalog).solve(cal, protein, budget, backend=backend,
+                                       time_limit=time_limit, mip_gap=mip_gap)
+    except Exception as e:
+        row.update(status="error", error=str(e))
+        return row
+
+    row.update(res.info())
+    if res.feasible:
+        result, total_cost, total_cal, total_protein = summarize_plan(catalog, res.x)
+        row.update(result=result, total_cost=total_cost, total_cal=total_cal, total_protein=total_protein)
+    return row
+
+
+def _solve_chunk(args):
+    start, items, path, options = args
+    return [solve_scenario(start + k, item, path, **options) for k, item in enumerate(items)]
+
+
+def solve_batch(scenarios, path=DATA_PATH, backend=None, time_limit=None, mip_gap=None,
+                chunksize=16, max_workers=None):
+    """
+    여러 (cal, protein, budget) 시나리오를 프로세스 풀에서 병렬로 풀이
+    - 입력 순서대로 결과 dict를 하나씩 yield (스트리밍용)
+    - 시나리오별 오류는 해당 결과에만 기록하고 배치는 계속 진행
+    """
+    scenarios = list(scenarios)
+    options = {"backend": backend, "time_limit": time_limit, "mip_gap": mip_gap}
+    chunks = [(s, scenarios[s:s + chunksize], path, options) for s in range(0, len(scenarios), chunksize)]
+    pool = get_pool(path, max_workers=max_workers)
+    for rows in pool.map(_solve_chunk, chunks):
+        yield from rows
@@ -0,0 +1,63 @@
+import threading
+from collections import OrderedDict
+from .catalog import on_publish
+
+
+class ResultCache:
+    """
+    최적화 결과 LRU 캐시
+    - 키: (cal_target, protein_target, budget_limit, catalog_version)
+    - 카탈로그 스냅샷이 교체되면(on_publish) 이전 버전 항목은 모두 제거
+    - hits / misses 카운터 제공
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def evict_version(self, version):
+        with self._lock:
+            for key in [k for k in self._data if k[-1] == version]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data),
+                    "maxsize": self.maxsize}
+
+    def __len__(self):
+        return len(self._data)
+
+
+result_cache = ResultCache()
+
+
+@on_publish
+def _evict_results(old, new):
+    if old is not None and old.version != new.version:
+        result_cache.evict_version(old.version)
@@ -0,0 +1,220 @@
+import os
+import hashlib
+import itertools
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl  # 여러 프로세스가 동시에 쓰지 않도록 (POSIX)
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# 기본 메뉴 데이터 경로 (app.py도 이 값을 사용)
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "menu_data.csv")
+
+COLUMNS = ["name", "cost", "cal", "protein"]
+
+
+class MenuCatalog:
+    """
+    메뉴 데이터를 열(column) 단위 NumPy 배열로 보관하는 카탈로그
+    - cost / cal / protein: 연속(contiguous) float64 배열
+    - index: 메뉴 이름 → 행 번호
+    - version: 원본 CSV 내용의 해시 (내용이 같으면 같은 버전)
+    - revision: 이 프로세스에서 게시(publish)된 순번
+    - 배열은 읽기 전용: 진행 중인 요청은 시작할 때 받은 스냅샷을 그대로 사용
+    """
+
+    def __init__(self, names, cost, cal, protein, version=None):
+        self.names = np.array(names, dtype=object)
+        self.cost = np.array(cost, dtype=np.float64)
+        self.cal = np.array(cal, dtype=np.float64)
+        self.protein = np.array(protein, dtype=np.float64)
+        for arr in (self.names, self.cost, self.cal, self.protein):
+            arr.setflags(write=False)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.version = version
+        self.revision = 0
+
+    @classmethod
+    def from_frame(cls, df, version=None):
+        missing = [c for c in COLUMNS if c not in df.columns]
+        if missing:
+            raise ValueError(f"메뉴 데이터에 필요한 컬럼이 없습니다: {missing}")
+        return cls(df["name"].to_numpy(), df["cost"].to_numpy(),
+                   df["cal"].to_numpy(), df["protein"].to_numpy(), version=version)
+
+    def __len__(self):
+        return len(self.names)
+
+    def rows(self, names):
+        return np.fromiter((self.index[n] for n in names), dtype=np.intp)
+
+    def to_frame(self):
+        return pd.DataFrame({"name": self.names, "cost": self.cost,
+                             "cal": self.cal, "protein": self.protein})
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_catalog(path=DATA_PATH):
+    """CSV를 한 번 읽어 MenuCatalog 생성 (캐시 없음)"""
+    version = file_hash(path)
+    return MenuCatalog.from_frame(pd.read_csv(path), version=version)
+
+
+# ===== 경로별 캐시 =====
+# path → (mtime_ns, size, catalog)
+_cache = {}
+_lock = threading.Lock()
+_revisions = itertools.count(1)
+
+# 새 스냅샷 게시 시 호출: callback(old_catalog 또는 None, new_catalog)
+_listeners = []
+
+
+def on_publish(callback):
+    """카탈로그 교체 알림 등록 (이전 버전에 묶인 캐시 제거용)"""
+    _listeners.append(callback)
+    return callback
+
+
+def _publish(path, st, catalog, old):
+    catalog.revision = next(_revisions)
+    _cache[path] = (st.st_mtime_ns, st.st_size, catalog)
+    for callback in _listeners:
+        callback(old, catalog)
+
+
+def get_catalog(path=DATA_PATH):
+    """
+    캐시된 카탈로그 반환
+    - 파일의 mtime/크기가 그대로면 stat 한 번으로 끝
+    - mtime이 바뀌어도 내용 해시가 같으면 기존 카탈로그 재사용
+    - 내용이 바뀌었으면 새 스냅샷을 게시 (다른 프로세스가 수정한 경우도 여기서 반영)
+    """
+    st = os.stat(path)
+    with _lock:
+        entry = _cache.get(path)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2]
+
+        version = file_hash(path)
+        if entry and entry[2].version == version:
+            _cache[path] = (st.st_mtime_ns, st.st_size, entry[2])
+            return entry[2]
+        catalog = MenuCatalog.from_frame(pd.read_csv(path), version=version)
+        _publish(path, st, catalog, entry[2] if entry else None)
+        return catalog
+
+
+# ===== 카탈로그 수정 (추가 / 수정 / 폐지) =====
+_write_lock = threading.Lock()
+
+
+class _FileLock:
+    """같은 CSV를 수정하는 다른 프로세스와의 배타 잠금 (fcntl이 없으면 프로세스 내부 잠금만)"""
+
+    def __init__(self, path):
+        self.path = path + ".lock"
+
+    def __enter__(self):
+        self.f = open(self.path, "a")
+        if fcntl is not None:
+            fcntl.flock(self.f, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.f, fcntl.LOCK_UN)
+        self.f.close()
+
+
+def _write_atomic(df, path):
+    """임시 파일에 쓰고 fsync 후 os.replace → 읽는 쪽은 항상 완전한 이전/새 파일만 봄"""
+    out = df.copy()
+    for col in COLUMNS[1:]:
+        values = out[col].to_numpy(dtype=np.float64)
+        if np.all(values == np.round(values)):
+            out[col] = values.astype(np.int64)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".menu_", suffix=".csv")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            out[COLUMNS].to_csv(f, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _mutate(path, change):
+    """현재 파일 기준으로 change(df) 적용 → 원자적 저장 → 새 스냅샷 게시"""
+    with _write_lock, _FileLock(path):
+        old = get_catalog(path)
+        df = change(pd.read_csv(path))
+        _write_atomic(df, path)
+        st = os.stat(path)
+        catalog = MenuCatalog.from_frame(df, version=file_hash(path))
+        with _lock:
+            _publish(path, st, catalog, old)
+        return catalog
+
+
+def _check_values(fields):
+    for key, value in fields.items():
+        if key not in COLUMNS[1:]:
+            raise ValueError(f"수정할 수 없는 항목: {key}")
+        if not np.isfinite(float(value)) or float(value) < 0:
+            raise ValueError(f"{key} 값은 0 이상의 숫자여야 합니다: {value!r}")
+
+
+def add_dish(name, cost, cal, protein, path=DATA_PATH):
+    """메뉴 추가 → 새 카탈로그 스냅샷"""
+    fields = {"cost": cost, "cal": cal, "protein": protein}
+    _check_values(fields)
+
+    def change(df):
+        if (df["name"] == name).any():
+            raise ValueError(f"이미 있는 메뉴입니다: {name}")
+        return pd.concat([df, pd.DataFrame([dict(name=name, **fields)])], ignore_index=True)
+
+    return _mutate(path, change)
+
+
+def update_dish(name, path=DATA_PATH, **fields):
+    """메뉴의 cost / cal / protein 수정 → 새 카탈로그 스냅샷"""
+    _check_values(fields)
+
+    def change(df):
+        mask = df["name"] == name
+        if not mask.any():
+            raise KeyError(name)
+        for key, value in fields.items():
+            df[key] = df[key].astype(np.float64)
+            df.loc[mask, key] = float(value)
+        return df
+
+    return _mutate(path, change)
+
+
+def retire_dish(name, path=DATA_PATH):
+    """메뉴 폐지 (카탈로그에서 제거) → 새 카탈로그 스냅샷"""
+
+    def change(df):
+        mask = df["name"] == name
+        if not mask.any():
+            raise KeyError(name)
+        return df[~mask].reset_index(drop=True)
+
+    return _mutate(path, change)
@@ -0,0 +1,77 @@
+import numpy as np
+from .catalog import get_catalog, DATA_PATH
+from .model import get_model
+from .cache import result_cache
+
+
+def summarize_plan(catalog, qty):
+    """
+    정수 수량 배열 → (result, total_cost, total_cal, total_protein)
+    기존 optimize_menu 반환 형식과 동일
+    """
+    qty = np.rint(np.nan_to_num(np.asarray(qty, dtype=np.float64))).astype(np.int64)
+    rows = np.flatnonzero(qty > 0)
+    cost = qty[rows] * catalog.cost[rows]
+    cal = qty[rows] * catalog.cal[rows]
+    protein = qty[rows] * catalog.protein[rows]
+
+    result = [
+        {"menu": catalog.names[r], "qty": int(q), "cost": float(c), "cal": float(k), "protein": float(p)}
+        for r, q, c, k, p in zip(rows, qty[rows], cost, cal, protein)
+    ]
+    return result, float(cost.sum()), float(cal.sum()), float(protein.sum())
+
+
+class MenuInfeasibleError(ValueError):
+    """목표를 만족하는 식단이 없거나 시간 제한 내에 해를 찾지 못한 경우"""
+
+    def __init__(self, status, message=None):
+        self.status = status
+        super().__init__(message or _STATUS_MESSAGES.get(status, f"식단을 찾지 못했습니다 ({status})."))
+
+
+_STATUS_MESSAGES = {
+    "infeasible": "예산 안에서 칼로리/단백질 목표를 만족하는 식단이 없습니다.",
+    "no_solution": "시간 제한 안에 가능한 식단을 찾지 못했습니다.",
+    "unbounded": "모델이 유계가 아닙니다 (메뉴 데이터를 확인하세요).",
+}
+
+
+def solve_menu(cal_target, protein_target, budget_limit, time_limit=None, mip_gap=None,
+               path=DATA_PATH, backend=None, use_cache=True):
+    """
+    시간 제한이 있는 풀이 (anytime)
+    - 제한 시간 안의 최선해와 증명된 gap, 솔버 상태를 dict로 반환
+    - 해가 없으면 result 없이 status만 반환 (예외를 던지지 않음)
+    - 최적으로 증명된 결과만 캐시 (캐시에서 꺼낸 결과는 cached=True)
+    """
+    catalog = get_catalog(path)
+    key = (cal_target, protein_target, budget_limit, catalog.version)
+    if use_cache:
+        cached = result_cache.get(key)
+        if cached is not None:
+            return dict(cached, result=[dict(row) for row in cached["result"]], cached=True)
+
+    res = get_model(catalog).solve(cal_target, protein_target, budget_limit, backend=backend,
+                                   time_limit=time_limit, mip_gap=mip_gap)
+    out = res.info()
+    if res.feasible:
+        result, total_cost, total_cal, total_protein = summarize_plan(catalog, res.x)
+        out.update(result=result, total_cost=total_cost, total_cal=total_cal, total_protein=total_protein)
+        if use_cache and res.status == "optimal" and not mip_gap:
+            result_cache.put(key, dict(out, result=[dict(row) for row in result]))
+    return out
+
+
+def optimize_menu(cal_target, protein_target, budget_limit, path=DATA_PATH, backend=None, use_cache=True,
+                  time_limit=None, mip_gap=None):
+    """
+    기존 반환 형식 (result, total_cost, total_cal, total_protein)
+    - 해가 없으면 MenuInfeasibleError
+    - 캐시는 solve_menu와 공유
+    """
+    out = solve_menu(cal_target, protein_target, budget_limit, time_limit=time_limit, mip_gap=mip_gap,
+                     path=path, backend=backend, use_cache=use_cache)
+    if "result" not in out:
+        raise MenuInfeasibleError(out["status"])
+    return out["result"], out["total_cost"], out["total_cal"], out["total_protein"]
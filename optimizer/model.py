@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from pulp import LpProblem, LpMinimize, LpVariable, LpAffineExpression
+from .catalog import on_publish
+from .solvers import resolve_backend, solve_highs, cbc_result, cbc_solver
+
+# 제약조건 행 순서: A @ x (>= / <=) rhs
+CONSTRAINTS = ["cal", "protein", "budget"]
+
+
+class MenuModel:
+    """
+    카탈로그 버전별로 한 번만 만드는 식단 모델 템플릿
+    - 목적함수/제약 행렬(c, A)과 PuLP 문제를 미리 구성
+    - 요청마다 우변(cal_target, protein_target, budget_limit)만 바꿔서 풀이
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.version = catalog.version
+        self.c = catalog.cost
+        self.A = np.vstack([catalog.cal, catalog.protein, catalog.cost])
+
+        self.prob = LpProblem("MilitaryMealPlan", LpMinimize)
+        self.vars = [LpVariable(f"servings_{i}", lowBound=0, cat="Integer") for i in range(len(catalog))]
+
+        # 비용 최소화
+        self.prob += LpAffineExpression(zip(self.vars, self.c.tolist()))
+
+        # 제약조건 (우변은 solve()에서 교체)
+        self.prob += LpAffineExpression(zip(self.vars, self.A[0].tolist())) >= 0, "cal"
+        self.prob += LpAffineExpression(zip(self.vars, self.A[1].tolist())) >= 0, "protein"
+        self.prob += LpAffineExpression(zip(self.vars, self.A[2].tolist())) <= 0, "budget"
+
+        # 같은 PuLP 객체를 여러 스레드가 동시에 수정하지 않도록 잠금
+        self._lock = threading.Lock()
+
+    def set_rhs(self, cal_target, protein_target, budget_limit):
+        self.prob.constraints["cal"].changeRHS(cal_target)
+        self.prob.constraints["protein"].changeRHS(protein_target)
+        self.prob.constraints["budget"].changeRHS(budget_limit)
+
+    def solve(self, cal_target, protein_target, budget_limit, backend=None, solver=None,
+              time_limit=None, mip_gap=None, warm_start=None):
+        """
+        우변만 갱신하고 풀이 → SolveResult (x: 메뉴별 정수 수량)
+        - highs: 미리 만든 (c, A)를 scipy milp에 그대로 전달 (프로세스 내부)
+        - cbc: PuLP 템플릿의 우변만 바꿔서 CBC 실행
+        - time_limit / mip_gap: 시간 제한(초)과 상대 gap, 도달 시 최선해와 gap 반환
+        - warm_start: 초기해(메뉴별 수량), CBC에만 전달 (scipy milp는 초기해 미지원)
+        """
+        backend = resolve_backend(backend)
+        if backend == "highs":
+            lb = np.array([cal_target, protein_target, -np.inf], dtype=np.float64)
+            ub = np.array([np.inf, np.inf, budget_limit], dtype=np.float64)
+            return solve_highs(self.c, self.A, lb, ub, time_limit=time_limit, mip_gap=mip_gap)
+
+        with self._lock:
+            self.set_rhs(cal_target, protein_target, budget_limit)
+            if warm_start is not None:
+                for var, q in zip(self.vars, np.asarray(warm_start).tolist()):
+                    var.setInitialValue(round(q))
+            t0 = time.perf_counter()
+            self.prob.solve(solver or cbc_solver(time_limit, mip_gap, warm_start=warm_start is not None))
+            return cbc_result(self.prob, self.vars, runtime=time.perf_counter() - t0)
+
+
+# ===== 카탈로그 버전별 모델 캐시 =====
+# 진행 중인 요청이 이전 스냅샷을 쓰는 동안에도 새 버전 모델과 공존하도록 몇 개 버전을 유지
+MAX_MODELS = 4
+_models = OrderedDict()
+_models_lock = threading.Lock()
+
+
+def get_model(catalog):
+    """같은 카탈로그 버전이면 이미 만든 모델을 재사용"""
+    with _models_lock:
+        model = _models.get(catalog.version)
+        if model is None:
+            model = MenuModel(catalog)
+            _models[catalog.version] = model
+            while len(_models) > MAX_MODELS:
+                _models.popitem(last=False)
+        _models.move_to_end(catalog.version)
+        return model
+
+
+@on_publish
+def _evict_model(old, new):
+    if old is not None and old.version != new.version:
+        with _models_lock:
+            _models.pop(old.version, None)
@@ -0,0 +1,264 @@
+import os
+import re
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from .catalog import DATA_PATH
+from .solvers import solve_milp, sparse
+
+# 기본 영양 DB 경로 (data/menu_data.csv 옆)
+DB_PATH = os.path.join(os.path.dirname(DATA_PATH), "nutrition.db")
+
+# 기본 영양소 컬럼 (CSV 가져오기 시 새 숫자 컬럼은 자동 추가)
+NUTRIENTS = ["cal", "protein", "fat", "carbs", "sugar", "fiber", "sodium", "cholesterol",
+             "saturated_fat", "calcium", "iron", "potassium", "vitamin_a", "vitamin_c"]
+
+# 태그 종류: flag(할랄/채식 등, 필수 조건), allergen(알레르기 유발 성분, 제외 조건)
+TAG_KINDS = ("flag", "allergen")
+
+_IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dishes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    category TEXT,
+    cost REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dishes_category ON dishes(category);
+CREATE TABLE IF NOT EXISTS dish_tags (
+    kind TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    dish_id INTEGER NOT NULL REFERENCES dishes(id) ON DELETE CASCADE,
+    PRIMARY KEY (kind, tag, dish_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_dish_tags_dish ON dish_tags(dish_id);
+"""
+
+
+def _check_ident(name):
+    if not _IDENT.match(name):
+        raise ValueError(f"잘못된 영양소 이름: {name!r}")
+    return name
+
+
+class NutritionTable:
+    """선택된 메뉴의 열 단위 배열 (names, cost, nutrients[이름] → float64 배열)"""
+
+    def __init__(self, ids, names, cost, nutrients):
+        self.ids = ids
+        self.names = names
+        self.cost = cost
+        self.nutrients = nutrients
+
+    def __len__(self):
+        return len(self.names)
+
+    def column(self, name):
+        if name == "cost":
+            return self.cost
+        if name not in self.nutrients:
+            raise KeyError(f"선택되지 않은 영양소: {name}")
+        return self.nutrients[name]
+
+
+class NutritionStore:
+    """
+    SQLite 기반 영양 데이터베이스
+    - dishes: 메뉴별 비용/분류/영양소 (category 인덱스)
+    - dish_tags: 플래그·알레르기 태그 ((kind, tag, dish_id) 기본키 인덱스)
+    - select(): 인덱스로 후보를 거른 뒤 필요한 컬럼만 NumPy 배열로 반환
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+            self._ensure_columns(conn, NUTRIENTS)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._local.conn = conn
+        return conn
+
+    def nutrients(self):
+        cols = [row[1] for row in self._conn().execute("PRAGMA table_info(dishes)")]
+        return [c for c in cols if c not in ("id", "name", "category", "cost")]
+
+    def _ensure_columns(self, conn, names):
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(dishes)")}
+        for name in names:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE dishes ADD COLUMN {_check_ident(name)} REAL NOT NULL DEFAULT 0")
+
+    # ===== 데이터 적재 =====
+    def import_frame(self, df, replace=False):
+        """
+        DataFrame 적재
+        - 필수: name, cost / 선택: category, flags·allergens(세미콜론 구분 문자열)
+        - 그 밖의 숫자 컬럼은 영양소로 취급 (없으면 컬럼 추가)
+        """
+        df = df.copy()
+        tags = {kind: df.pop(kind + "s") if kind + "s" in df.columns else None for kind in TAG_KINDS}
+        if "category" not in df.columns:
+            df["category"] = None
+        nutrient_cols = [c for c in df.columns if c not in ("name", "category", "cost")]
+        cols = ["name", "category", "cost"] + nutrient_cols
+
+        conn = self._conn()
+        with conn:
+            self._ensure_columns(conn, nutrient_cols)
+            if replace:
+                conn.execute("DELETE FROM dish_tags")
+                conn.execute("DELETE FROM dishes")
+            placeholders = ", ".join("?" * len(cols))
+            updates = ", ".join(f"{c} = excluded.{c}" for c in cols[1:])
+            conn.executemany(
+                f"INSERT INTO dishes ({', '.join(cols)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(name) DO UPDATE SET {updates}",
+                df[cols].astype(object).where(df[cols].notna(), None).itertuples(index=False, name=None),
+            )
+            ids = dict(conn.execute("SELECT name, id FROM dishes"))
+            for kind, values in tags.items():
+                if values is None:
+                    continue
+                rows = [(kind, tag.strip(), ids[name])
+                        for name, value in zip(df["name"], values) if isinstance(value, str)
+                        for tag in value.split(";") if tag.strip()]
+                conn.executemany("INSERT OR IGNORE INTO dish_tags (kind, tag, dish_id) VALUES (?, ?, ?)", rows)
+        return len(df)
+
+    def import_csv(self, path=DATA_PATH, replace=False):
+        return self.import_frame(pd.read_csv(path), replace=replace)
+
+    # ===== 조회 =====
+    def select(self, columns, categories=None, flags=(), exclude_allergens=()):
+        """
+        인덱스를 사용해 조건에 맞는 메뉴만 조회
+        - categories: 허용 분류 목록 (category 인덱스)
+        - flags: 모두 만족해야 하는 플래그 (예: ["halal"])
+        - exclude_allergens: 하나라도 포함하면 제외 (예: ["egg", "milk"])
+        """
+        columns = [_check_ident(c) for c in columns if c != "cost"]
+        unknown = sorted(set(columns) - set(self.nutrients()))
+        if unknown:
+            raise ValueError(f"알 수 없는 영양소: {', '.join(unknown)}")
+        where, params = [], []
+        if categories:
+            where.append(f"d.category IN ({', '.join('?' * len(categories))})")
+            params += list(categories)
+        for flag in flags:
+            where.append("d.id IN (SELECT dish_id FROM dish_tags WHERE kind = 'flag' AND tag = ?)")
+            params.append(flag)
+        if exclude_allergens:
+            where.append("d.id NOT IN (SELECT dish_id FROM dish_tags WHERE kind = 'allergen' "
+                         f"AND tag IN ({', '.join('?' * len(exclude_allergens))}))")
+            params += list(exclude_allergens)
+
+        sql = f"SELECT d.id, d.name, d.cost{''.join(', d.' + c for c in columns)} FROM dishes d"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        rows = self._conn().execute(sql + " ORDER BY d.id", params).fetchall()
+
+        if rows:
+            ids, names, cost, *values = zip(*rows)
+        else:
+            ids, names, cost, values = (), (), (), [()] * len(columns)
+        return NutritionTable(
+            np.array(ids, dtype=np.int64), np.array(names, dtype=object),
+            np.array(cost, dtype=np.float64),
+            {c: np.array(v, dtype=np.float64) for c, v in zip(columns, values)},
+        )
+
+
+# ===== 선언형 제약 =====
+_SPEC = re.compile(
+    r"^\s*(?P<name>[A-Za-z_][A-Za-z0-9_]*)"
+    r"(?:\s+between\s+(?P<lo>[-\d.eE+]+)\s+and\s+(?P<hi>[-\d.eE+]+)|\s*(?P<op>>=|<=|==)\s*(?P<val>[-\d.eE+]+))\s*$",
+    re.IGNORECASE,
+)
+
+
+def parse_constraint(item):
+    """
+    "sodium between 0 and 2000" / "protein >= 70" / "protein>=70" / "cost <= 10000"
+    또는 {"nutrient": "sodium", "min": 0, "max": 2000} → (이름, 하한, 상한)
+    """
+    if isinstance(item, dict):
+        name = item.get("nutrient") or item["name"]
+        lo = item.get("min")
+        hi = item.get("max")
+        return _check_ident(name), -np.inf if lo is None else float(lo), np.inf if hi is None else float(hi)
+
+    m = _SPEC.match(item)
+    if not m:
+        raise ValueError(f"제약 형식 오류: {item!r} (예: 'sodium between 0 and 2000', 'protein >= 70')")
+    name = m.group("name")
+    if m.group("op") is None:
+        return name, float(m.group("lo")), float(m.group("hi"))
+    val = float(m.group("val"))
+    lo, hi = {">=": (val, np.inf), "<=": (-np.inf, val), "==": (val, val)}[m.group("op")]
+    return name, lo, hi
+
+
+def _normalize(spec):
+    return [parse_constraint(item) for item in spec]
+
+
+def compile_constraints(table, spec):
+    """제약 목록 → 희소 행렬 A (행: 제약, 열: 메뉴)와 하한/상한 벡터 (0이 아닌 값만 COO로 모아 바로 구성, scipy가 없으면 밀집)"""
+    constraints = _normalize(spec)
+    rows, cols, data = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)], [np.empty(0)]
+    for r, (name, _, _) in enumerate(constraints):
+        values = table.column(name)
+        nz = np.flatnonzero(values)
+        rows.append(np.full(len(nz), r, dtype=np.int64))
+        cols.append(nz)
+        data.append(values[nz])
+    rows, cols, data = np.concatenate(rows), np.concatenate(cols), np.concatenate(data)
+    if sparse is None:
+        # scipy가 없으면 (CBC 대체 경로) 밀집 행렬로
+        A = np.zeros((len(constraints), len(table)))
+        A[rows, cols] = data
+    else:
+        A = sparse.csr_matrix((data, (rows, cols)), shape=(len(constraints), len(table)))
+    lb = np.array([lo for _, lo, _ in constraints], dtype=np.float64)
+    ub = np.array([hi for _, _, hi in constraints], dtype=np.float64)
+    return A, lb, ub
+
+
+def optimize_nutrition(store, spec, categories=None, flags=(), exclude_allergens=(), max_servings=None,
+                       time_limit=None, mip_gap=None, backend=None):
+    """
+    다영양소 제약 식단 최적화 (비용 최소화)
+    - 인덱스로 후보 메뉴를 거른 뒤 선언형 제약을 희소 행렬로 컴파일해서 풀이
+    """
+    names = sorted({name for name, _, _ in _normalize(spec)} - {"cost"})
+    table = store.select(names, categories=categories, flags=flags, exclude_allergens=exclude_allergens)
+    out = {"candidates": len(table)}
+    if len(table) == 0:
+        out["status"] = "infeasible"
+        return out
+
+    A, lb, ub = compile_constraints(table, spec)
+    res = solve_milp(table.cost, A, lb, ub, backend=backend, x_upper=max_servings,
+                     time_limit=time_limit, mip_gap=mip_gap)
+    out.update(res.info())
+    if not res.feasible:
+        return out
+
+    qty = np.rint(res.x)
+    rows = np.flatnonzero(qty > 0)
+    out["result"] = [
+        dict({"menu": table.names[r], "qty": int(qty[r]), "cost": float(qty[r] * table.cost[r])},
+             **{n: float(qty[r] * table.nutrients[n][r]) for n in names})
+        for r in rows
+    ]
+    out["totals"] = dict({"cost": float(qty @ table.cost)}, **{n: float(qty @ table.nutrients[n]) for n in names})
+    return out
@@ -0,0 +1,212 @@
+import numpy as np
+from .catalog import get_catalog, MenuCatalog, DATA_PATH
+from .solvers import solve_milp, sparse
+from .menu import summarize_plan
+
+# 다양성 제약이 있을 때 기본 후보 메뉴 파레토 층 수 (변수 수가 블록 수 × 메뉴 수로 늘어나므로)
+VARIETY_CANDIDATE_LAYERS = 2
+
+
+def pareto_layers(catalog, layers):
+    """
+    1원당 (칼로리, 단백질) 기준 파레토 층을 바깥에서부터 layers개까지 벗겨낸 메뉴 행 번호
+    후보 축소용 휴리스틱: 정수 인분, 공급 상한, 예산, 다양성 제약 때문에 안쪽 층 메뉴가 최적해에 필요할 수 있음
+    """
+    ok = catalog.cost > 0
+    alpha = np.where(ok, catalog.cal / np.where(ok, catalog.cost, 1), 0)
+    beta = np.where(ok, catalog.protein / np.where(ok, catalog.cost, 1), 0)
+    alive = np.flatnonzero(ok)
+    keep = []
+    for _ in range(layers):
+        if len(alive) == 0:
+            break
+        order = alive[np.lexsort((-beta[alive], -alpha[alive]))]
+        b = beta[order]
+        front = order[b > np.concatenate([[-np.inf], np.maximum.accumulate(b)[:-1]])]
+        keep.append(front)
+        alive = np.setdiff1d(alive, front, assume_unique=True)
+    return np.sort(np.concatenate(keep)) if keep else alive
+
+
+def _dish_caps(catalog, cal_min, protein_min, max_servings, budget=None):
+    """
+    메뉴별 하루 최대 인분 (연결 제약의 big-M)
+    - max_servings가 없으면 그 메뉴 하나로 하루 하한을 채우는 데 필요한 인분 수
+      (그보다 많으면 줄여도 하한을 만족하므로 비용 최소해에는 필요 없음)
+    - budget: 하루에 쓸 수 있는 최대 금액 → 그 금액으로 살 수 있는 인분 수로 추가 제한
+    """
+    if max_servings is not None:
+        caps = np.full(len(catalog), float(max_servings))
+    else:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            need_cal = np.where(catalog.cal > 0, np.ceil(cal_min / catalog.cal), 0)
+            need_protein = np.where(catalog.protein > 0, np.ceil(protein_min / catalog.protein), 0)
+        caps = np.maximum(np.maximum(need_cal, need_protein), 1)
+    if budget is not None:
+        with np.errstate(divide="ignore"):
+            affordable = np.where(catalog.cost > 0, np.floor(budget / catalog.cost), np.inf)
+        caps = np.minimum(caps, affordable)
+    return caps
+
+
+def day_blocks(days, max_repeats=None, min_distinct=None):
+    """
+    같은 식단을 쓰는 날 묶음(블록)별 일수
+    - 날마다 제약이 같으므로 다양성 제약이 없으면 하루 최적 식단을 반복 (블록 1개, 정확)
+    - max_repeats가 있으면 max_repeats일씩 묶고 한 메뉴는 한 블록에만 사용 (사용 일수 상한 자동 충족)
+      블록 안의 날은 같은 식단이므로 전체 모델의 제한된 형태 (블록이 1일이면 정확)
+    - min_distinct만 있으면 하루씩 (정확)
+    """
+    if max_repeats is None:
+        size = 1 if min_distinct is not None else days
+    else:
+        size = max(1, min(int(max_repeats), days))
+    sizes = np.full(days // size, size, dtype=np.float64)
+    if days % size:
+        sizes = np.append(sizes, days % size)
+    return sizes
+
+
+def build_week_model(catalog, days, cal_min, protein_min, budget=None, daily_budget=None,
+                     max_repeats=None, min_distinct=None, max_servings=None):
+    """
+    N일 식단 모델을 블록 단위 희소 행렬로 한 번에 구성 (Python 루프 없이 kron/hstack 사용)
+    변수 순서: x[b, i] (블록 b 하루 인분, B*n) | y[b, i] (블록 b에서 i 메뉴 사용 여부, B*n)
+               | z[i] (기간 중 사용 여부, n, max_repeats 없이 min_distinct만 있을 때)
+    반환: (c, A, lb, ub, integrality, x_upper, sizes)
+    """
+    if sparse is None:
+        raise RuntimeError("N일 식단 계획에는 scipy가 필요합니다.")
+    if days < 1:
+        raise ValueError("days는 1 이상이어야 합니다.")
+    if max_repeats is not None and max_repeats < 1:
+        raise ValueError("max_repeats는 1 이상이어야 합니다.")
+    if max_repeats is not None and max_repeats >= days:
+        max_repeats = None  # 기간보다 길면 의미 없는 제약 (날을 묶을 필요 없음)
+    sizes = day_blocks(days, max_repeats, min_distinct)
+    n, B = len(catalog), len(sizes)
+    nx = B * n
+    use_y = max_repeats is not None or min_distinct is not None
+    # 블록 크기가 max_repeats이면 한 메뉴는 한 블록에만 들어가므로 서로 다른 메뉴 수 = sum y (z 불필요)
+    use_z = min_distinct is not None and max_repeats is None
+    ny = nx if use_y else 0
+    nz = n if use_z else 0
+    nvar = nx + ny + nz
+    eye_b = sparse.identity(B, format="csr")
+
+    def pad(block, left, right_to=nvar):
+        block = sparse.csr_matrix(block)
+        parts = []
+        if left:
+            parts.append(sparse.csr_matrix((block.shape[0], left)))
+        parts.append(block)
+        rest = right_to - left - block.shape[1]
+        if rest:
+            parts.append(sparse.csr_matrix((block.shape[0], rest)))
+        return sparse.hstack(parts, format="csr")
+
+    rows, lbs, ubs = [], [], []
+
+    def add(block, lo, hi):
+        rows.append(block)
+        lbs.append(np.broadcast_to(lo, block.shape[0]).astype(np.float64))
+        ubs.append(np.broadcast_to(hi, block.shape[0]).astype(np.float64))
+
+    # 1. 하루 영양 하한 (블록당 1행씩)
+    add(pad(sparse.kron(eye_b, catalog.cal[None, :]), 0), cal_min, np.inf)
+    add(pad(sparse.kron(eye_b, catalog.protein[None, :]), 0), protein_min, np.inf)
+
+    # 2. 예산: 하루 상한 / 기간 전체 상한 (블록 하루 비용 × 일수)
+    if daily_budget is not None:
+        add(pad(sparse.kron(eye_b, catalog.cost[None, :]), 0), -np.inf, daily_budget)
+    if budget is not None:
+        add(pad(np.kron(sizes, catalog.cost)[None, :], 0), -np.inf, budget)
+
+    # 하루 최대 인분: 하루 예산과 기간 예산(하루가 전부 쓰는 경우)으로도 제한
+    day_budget = min((float(b) for b in (budget, daily_budget) if b is not None), default=None)
+    caps = _dish_caps(catalog, cal_min, protein_min, max_servings, day_budget)
+    x_upper = np.tile(caps, B)
+
+    if use_y:
+        # 3. 연결: y[b,i] <= x[b,i] <= cap_i * y[b,i]
+        link = sparse.hstack([sparse.identity(nx), sparse.diags(-x_upper)], format="csr")
+        add(pad(link, 0), -np.inf, 0)
+        used = sparse.hstack([sparse.identity(nx), -sparse.identity(nx)], format="csr")
+        add(pad(used, 0), 0, np.inf)
+
+    if max_repeats is not None:
+        # 4. 메뉴별 사용 일수 상한: sum_b size_b * y[b,i] <= max_repeats
+        add(pad(sparse.kron(sizes[None, :], sparse.identity(n)), nx), -np.inf, max_repeats)
+
+    if min_distinct is not None:
+        if use_z:
+            # 5. 서로 다른 메뉴 수: z_i <= sum_b y[b,i],  sum_i z_i >= min_distinct
+            distinct = sparse.hstack([-sparse.kron(np.ones((1, B)), sparse.identity(n)), sparse.identity(n)])
+            add(pad(distinct, nx), -np.inf, 0)
+            add(pad(np.ones((1, n)), nx + ny), min_distinct, np.inf)
+        else:
+            # 5. 블록끼리 메뉴가 겹치지 않으므로 sum y >= min_distinct
+            add(pad(np.ones((1, ny)), nx), min_distinct, np.inf)
+
+    A = sparse.vstack(rows, format="csr")
+    c = np.concatenate([np.kron(sizes, catalog.cost), np.zeros(ny + nz)])
+    integrality = np.ones(nvar)
+    upper = np.concatenate([x_upper, np.ones(ny + nz)])
+    return c, A, np.concatenate(lbs), np.concatenate(ubs), integrality, upper, sizes
+
+
+def plan_week(cal_min, protein_min, days=7, budget=None, daily_budget=None, max_repeats=None,
+              min_distinct=None, max_servings=None, time_limit=30, mip_gap=None, path=DATA_PATH,
+              catalog=None, backend=None, candidate_layers=VARIETY_CANDIDATE_LAYERS):
+    """
+    N일 식단 계획
+    - cal_min / protein_min: 하루 영양 하한
+    - budget: 기간 전체 예산 상한, daily_budget: 하루 예산 상한
+    - max_repeats: 한 메뉴를 사용할 수 있는 최대 일수
+    - min_distinct: 기간 중 사용해야 하는 서로 다른 메뉴 최소 개수
+    - time_limit: 솔버 시간 제한(초), 초과 시 그때까지의 최선해 반환
+    - candidate_layers: 다양성 제약이 있을 때 후보 메뉴를 파레토 층 수로 제한 (None이면 전체)
+      불가능하면 층을 늘려 재시도
+    max_repeats로 날을 묶거나 후보를 줄인 경우 전체 문제의 최적해가 아닐 수 있으므로
+    status를 "feasible"로 낮추고 heuristic=True로 표시
+    """
+    full = catalog or get_catalog(path)
+    use_y = max_repeats is not None or min_distinct is not None
+    layers = candidate_layers if use_y else None
+    while True:
+        if layers is None:
+            rows = np.arange(len(full))
+        else:
+            rows = pareto_layers(full, layers)
+        catalog = MenuCatalog(full.names[rows], full.cost[rows], full.cal[rows], full.protein[rows],
+                              version=full.version)
+        c, A, lb, ub, integrality, upper, sizes = build_week_model(
+            catalog, days, cal_min, protein_min, budget=budget, daily_budget=daily_budget,
+            max_repeats=max_repeats, min_distinct=min_distinct, max_servings=max_servings)
+        res = solve_milp(c, A, lb, ub, backend=backend, integrality=integrality, x_upper=upper,
+                         time_limit=time_limit, mip_gap=mip_gap)
+        if res.status != "infeasible" or layers is None or len(rows) == len(full):
+            break
+        layers *= 2
+
+    plan = res.info()
+    plan["candidates"] = len(catalog)
+    # 블록으로 묶인 날이 있고 다양성 제약이 실제로 블록에 걸리는 경우 (블록 1개 + max_repeats만이면 정확)
+    grouped = use_y and sizes.max() > 1 and (min_distinct is not None or len(sizes) > 1)
+    plan["heuristic"] = len(catalog) < len(full) or grouped
+    if plan["heuristic"] and plan["status"] == "optimal":
+        plan["status"] = "feasible"
+    plan["days"] = []
+    if not res.feasible:
+        return plan
+
+    n = len(catalog)
+    block_qty = np.rint(res.x[:len(sizes) * n]).reshape(len(sizes), n)
+    qty = np.repeat(block_qty, sizes.astype(int), axis=0)
+    for d in range(days):
+        result, total_cost, total_cal, total_protein = summarize_plan(catalog, qty[d])
+        plan["days"].append({"day": d + 1, "result": result, "total_cost": total_cost,
+                             "total_cal": total_cal, "total_protein": total_protein})
+    plan["total_cost"] = float((qty * catalog.cost).sum())
+    plan["distinct_dishes"] = int((qty.sum(axis=0) > 0).sum())
+    return plan
@@ -0,0 +1,170 @@
+import numpy as np
+from .catalog import get_catalog, MenuCatalog, DATA_PATH
+from .solvers import solve_milp, sparse
+from .menu import summarize_plan
+from .planner import _dish_caps, pareto_layers
+
+# 기본 대량 구매 할인 구간: (누적 수량 하한, 단가 배율)
+DEFAULT_TIERS = [(0, 1.0)]
+
+
+def _check_tiers(tiers):
+    tiers = sorted((float(t), float(m)) for t, m in tiers)
+    if not tiers or tiers[0][0] != 0:
+        tiers = [(0.0, 1.0)] + tiers
+    mults = [m for _, m in tiers]
+    if any(b > a for a, b in zip(mults, mults[1:])):
+        raise ValueError("할인 구간의 단가 배율은 수량이 늘수록 작아져야 합니다.")
+    return tiers
+
+
+def build_procurement_model(catalog, units, supply_caps=None, tiers=DEFAULT_TIERS):
+    """
+    여러 부대를 하나의 모델로 묶는 블록 구조 희소 모델
+    변수 순서:
+      x[u, i]  부대 u 1인당 메뉴 i 인분 (U*n, 정수)
+      s[k, i]  메뉴 i 총 수량 중 할인 구간 k에 해당하는 양 (K*n, 연속)
+      w[k, i]  메뉴 i 총 수량이 구간 k(k>=1)에 도달했는지 (⁠(K-1)*n, 이진)
+    제약:
+      부대별 1인 칼로리/단백질 하한, 1인 예산 상한 (kron(I_U, 행))
+      sum_k s[k,i] = sum_u headcount_u * x[u,i]     (총 주문량)
+      sum_k s[k,i] <= supply_cap_i                  (공급 상한)
+      구간 k는 k-1 구간을 다 채운 뒤에만 사용 (w로 순서 강제)
+    """
+    if sparse is None:
+        raise RuntimeError("통합 조달 최적화에는 scipy가 필요합니다.")
+    n, U = len(catalog), len(units)
+    tiers = _check_tiers(tiers)
+    K = len(tiers)
+    heads = np.array([float(u["headcount"]) for u in units])
+    cal = np.array([float(u["cal"]) for u in units])
+    protein = np.array([float(u["protein"]) for u in units])
+    budget = np.array([np.inf if u.get("budget") is None else float(u["budget"]) for u in units])
+
+    caps = np.full(n, np.inf) if supply_caps is None else np.asarray(supply_caps, dtype=np.float64)
+    per_person = _dish_caps(catalog, cal.max(initial=0), protein.max(initial=0), None)
+    # 구간 순서 제약의 big-M: 공급 상한과 '전원이 최대 인분을 먹는 경우' 중 작은 값
+    total_cap = np.minimum(caps, heads.sum() * per_person)
+
+    nx, ns, nw = U * n, K * n, (K - 1) * n
+    nvar = nx + ns + nw
+    eye_n = sparse.identity(n, format="csr")
+
+    def cols(block, left):
+        block = sparse.csr_matrix(block)
+        return sparse.hstack([sparse.csr_matrix((block.shape[0], left)), block,
+                              sparse.csr_matrix((block.shape[0], nvar - left - block.shape[1]))], format="csr")
+
+    rows, lbs, ubs = [], [], []
+
+    def add(block, lo, hi):
+        rows.append(block)
+        lbs.append(np.broadcast_to(lo, block.shape[0]).astype(np.float64))
+        ubs.append(np.broadcast_to(hi, block.shape[0]).astype(np.float64))
+
+    eye_u = sparse.identity(U, format="csr")
+    add(cols(sparse.kron(eye_u, catalog.cal[None, :]), 0), cal, np.inf)
+    add(cols(sparse.kron(eye_u, catalog.protein[None, :]), 0), protein, np.inf)
+    if np.isfinite(budget).any():
+        add(cols(sparse.kron(eye_u, catalog.cost[None, :]), 0), -np.inf, budget)
+
+    # 총 주문량 연결: sum_k s[k,i] - sum_u h_u x[u,i] = 0
+    link = sparse.hstack([-sparse.kron(heads[None, :], eye_n), sparse.kron(np.ones((1, K)), eye_n)])
+    add(cols(link, 0), 0, 0)
+
+    # 공급 상한: sum_k s[k,i] <= cap_i (구간별 상한만으로는 여러 구간 합이 상한을 넘을 수 있음)
+    capped = np.flatnonzero(np.isfinite(caps))
+    if len(capped):
+        add(cols(sparse.kron(np.ones((1, K)), eye_n, format="csr")[capped], nx), -np.inf, caps[capped])
+
+    # 구간 폭 (마지막 구간은 big-M까지)
+    starts = np.array([t for t, _ in tiers])
+    widths = np.empty((K, n))
+    widths[:-1] = (starts[1:] - starts[:-1])[:, None]
+    widths[-1] = np.maximum(total_cap - starts[-1], 0)
+    s_upper = np.minimum(widths, total_cap[None, :]).ravel()
+
+    if K > 1:
+        # s[k-1,i] >= width_{k-1} * w[k,i],  s[k,i] <= width_k * w[k,i]
+        prev_s = sparse.hstack([sparse.identity(nw), sparse.csr_matrix((nw, n))])
+        next_s = sparse.hstack([sparse.csr_matrix((nw, n)), sparse.identity(nw)])
+        add(cols(sparse.hstack([prev_s, sparse.diags(-widths[:-1].ravel())]), nx), 0, np.inf)
+        add(cols(sparse.hstack([next_s, sparse.diags(-widths[1:].ravel())]), nx), -np.inf, 0)
+
+    A = sparse.vstack(rows, format="csr")
+    mults = np.array([m for _, m in tiers])
+    c = np.concatenate([np.zeros(nx), (mults[:, None] * catalog.cost[None, :]).ravel(), np.zeros(nw)])
+    integrality = np.concatenate([np.ones(nx), np.zeros(ns), np.ones(nw)])
+    upper = np.concatenate([np.tile(per_person, U), s_upper, np.ones(nw)])
+    return c, A, np.concatenate(lbs), np.concatenate(ubs), integrality, upper
+
+
+def plan_procurement(units, supply_caps=None, tiers=DEFAULT_TIERS, time_limit=60, mip_gap=None,
+                     candidate_layers=None, path=DATA_PATH, catalog=None, backend=None):
+    """
+    부대 통합 조달 최적화
+    - units: [{"name", "headcount", "cal", "protein", "budget"(1인, 선택)}, ...]
+    - supply_caps: {메뉴 이름: 최대 공급량} (없으면 무제한)
+    - tiers: [(누적 수량, 단가 배율), ...] 예: [(0, 1.0), (1000, 0.95), (5000, 0.9)]
+    - candidate_layers: 후보 메뉴를 파레토 층 수로 제한 (대규모 모델용 휴리스틱, None이면 전체)
+      축소한 모델의 최적해는 전체 문제의 최적해가 아닐 수 있으므로
+      status를 "feasible"로 낮추고 heuristic=True로 표시
+    반환: 부대별 1인 식단 + 통합 주문서
+    """
+    full = catalog or get_catalog(path)
+    full_caps = None
+    if supply_caps:
+        full_caps = np.full(len(full), np.inf)
+        for name, cap in supply_caps.items():
+            full_caps[full.index[name]] = float(cap)
+
+    # 후보 축소: 파레토 바깥 층 메뉴만 사용, 불가능하면 층을 늘려 재시도 (None이면 전체 사용)
+    layers = candidate_layers
+    while True:
+        if layers is None:
+            rows = np.arange(len(full))
+        else:
+            rows = pareto_layers(full, layers)
+        catalog = MenuCatalog(full.names[rows], full.cost[rows], full.cal[rows], full.protein[rows],
+                              version=full.version)
+        caps = None if full_caps is None else full_caps[rows]
+
+        c, A, lb, ub, integrality, upper = build_procurement_model(catalog, units, caps, tiers)
+        res = solve_milp(c, A, lb, ub, backend=backend, integrality=integrality, x_upper=upper,
+                         time_limit=time_limit, mip_gap=mip_gap)
+        if res.status != "infeasible" or layers is None or len(rows) == len(full):
+            break
+        layers *= 2
+
+    out = res.info()
+    out["candidates"] = len(catalog)
+    out["heuristic"] = len(catalog) < len(full)
+    if out["heuristic"] and out["status"] == "optimal":
+        out["status"] = "feasible"
+    if not res.feasible:
+        return out
+
+    n = len(catalog)
+    x = np.rint(res.x[:len(units) * n]).reshape(len(units), n)
+    heads = np.array([float(u["headcount"]) for u in units])
+
+    out["units"] = []
+    for u, unit in enumerate(units):
+        result, total_cost, total_cal, total_protein = summarize_plan(catalog, x[u])
+        out["units"].append({"name": unit.get("name", f"unit_{u + 1}"), "headcount": unit["headcount"],
+                             "result": result, "total_cost": total_cost,
+                             "total_cal": total_cal, "total_protein": total_protein})
+
+    quantity = heads @ x
+    tiers = _check_tiers(tiers)
+    s = res.x[len(units) * n:len(units) * n + len(tiers) * n].reshape(len(tiers), n)
+    mults = np.array([m for _, m in tiers])
+    paid = (mults[:, None] * s).sum(axis=0) * catalog.cost
+    order = []
+    for i in np.flatnonzero(quantity > 0):
+        order.append({"menu": catalog.names[i], "quantity": int(quantity[i]),
+                      "list_cost": float(quantity[i] * catalog.cost[i]), "cost": round(float(paid[i]), 2)})
+    out["order"] = order
+    out["total_list_cost"] = float(quantity @ catalog.cost)
+    out["total_cost"] = round(float(paid.sum()), 2)
+    return out
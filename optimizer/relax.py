@@ -0,0 +1,165 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+from .catalog import get_catalog, on_publish, DATA_PATH
+from .menu import summarize_plan
+
+
+class RelaxedModel:
+    """
+    연속 완화(LP) 기반 근사 식단 모델
+    - 제약이 칼로리/단백질 두 개뿐이므로 LP 최적해는 최대 두 메뉴의 조합
+    - 메뉴를 '1원당 (칼로리, 단백질)' 점으로 보고, 그 볼록 껍질(hull)을 카탈로그 버전별로 미리 계산
+    - 요청마다 목표 방향 (cal, protein) 반직선이 hull과 만나는 변만 찾으면 LP 최적해와 쌍대값을 얻음
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.version = catalog.version
+        valid = np.flatnonzero((catalog.cost > 0) & ((catalog.cal > 0) | (catalog.protein > 0)))
+        alpha = catalog.cal[valid] / catalog.cost[valid]
+        beta = catalog.protein[valid] / catalog.cost[valid]
+
+        # 1. 파레토 필터: α 내림차순으로 보면서 β가 지금까지의 최대보다 커지는 점만 남김
+        order = np.lexsort((-beta, -alpha))
+        b = beta[order]
+        prev_max = np.concatenate([[-np.inf], np.maximum.accumulate(b)[:-1]])
+        front = order[b > prev_max]
+
+        # 2. 위쪽 볼록 껍질 (α 내림차순 / β 오름차순, 파레토 점 수만큼만 반복)
+        hull = []
+        for k in front:
+            while len(hull) >= 2:
+                i, j = hull[-2], hull[-1]
+                cross = (alpha[j] - alpha[i]) * (beta[k] - beta[i]) - (beta[j] - beta[i]) * (alpha[k] - alpha[i])
+                if cross > 0:  # j가 i-k 선분 바깥쪽이면 유지, 아니면 제거
+                    break
+                hull.pop()
+            hull.append(k)
+
+        self.rows = valid[np.array(hull, dtype=np.intp)]
+        self.alpha = alpha[hull]
+        self.beta = beta[hull]
+
+    def solve_lp(self, cal_target, protein_target):
+        """
+        연속 완화 풀이 → (x, lp_bound, (cal 쌍대값, protein 쌍대값))
+        쌍대값: 목표 1단위 증가 시 최소 비용 증가분 (shadow price)
+        """
+        cat = self.catalog
+        x = np.zeros(len(cat))
+        C, P = max(float(cal_target), 0.0), max(float(protein_target), 0.0)
+        if C == 0 and P == 0:
+            return x, 0.0, (0.0, 0.0)
+        if len(self.rows) == 0:
+            return None, np.inf, (np.inf, np.inf)
+
+        # 반직선 t*(C, P) 기준으로 각 꼭짓점이 위(+)/아래(-) 어느 쪽인지
+        side = C * self.beta - P * self.alpha
+        if side[0] >= 0:
+            # 칼로리 효율이 가장 좋은 메뉴 하나로 충분 (칼로리 제약만 활성)
+            r = self.rows[0]
+            if cat.cal[r] <= 0:
+                return None, np.inf, (np.inf, np.inf)
+            x[r] = C / cat.cal[r]
+            u, v = 1.0 / self.alpha[0], 0.0
+        elif side[-1] <= 0:
+            # 단백질 효율이 가장 좋은 메뉴 하나로 충분 (단백질 제약만 활성)
+            r = self.rows[-1]
+            if cat.protein[r] <= 0:
+                return None, np.inf, (np.inf, np.inf)
+            x[r] = P / cat.protein[r]
+            u, v = 0.0, 1.0 / self.beta[-1]
+        else:
+            j = int(np.flatnonzero(side < 0)[-1])
+            a, b = self.rows[j], self.rows[j + 1]
+            M = np.array([[cat.cal[a], cat.cal[b]], [cat.protein[a], cat.protein[b]]])
+            x[[a, b]] = np.maximum(np.linalg.solve(M, [C, P]), 0)
+            u, v = np.linalg.solve([[self.alpha[j], self.beta[j]], [self.alpha[j + 1], self.beta[j + 1]]], [1.0, 1.0])
+
+        return x, float(C * u + P * v), (float(u), float(v))
+
+    def round_plan(self, x_lp, cal_target, protein_target):
+        """
+        LP 해 → 정수 인분
+        - 올림 해와, 내림 후 탐욕적으로 부족분을 채운 해 중 더 싼 것
+        - 마지막으로 제약을 유지하는 한 비싼 메뉴부터 1인분씩 제거
+        """
+        cat = self.catalog
+        C, P = float(cal_target), float(protein_target)
+
+        def repair(q):
+            while True:
+                d_cal = C - q @ cat.cal
+                d_pro = P - q @ cat.protein
+                if d_cal <= 0 and d_pro <= 0:
+                    return q
+                gain = (np.minimum(cat.cal, max(d_cal, 0)) / max(C, 1.0)
+                        + np.minimum(cat.protein, max(d_pro, 0)) / max(P, 1.0))
+                best = int(np.argmax(gain / np.maximum(cat.cost, 1e-9)))
+                if gain[best] <= 0:
+                    return None
+                q[best] += 1
+
+        def trim(q):
+            used = np.flatnonzero(q > 0)
+            for r in used[np.argsort(-cat.cost[used])]:
+                while q[r] > 0 and (q @ cat.cal - cat.cal[r] >= C) and (q @ cat.protein - cat.protein[r] >= P):
+                    q[r] -= 1
+            return q
+
+        candidates = [trim(np.ceil(x_lp - 1e-9))]
+        floored = repair(np.floor(x_lp + 1e-9))
+        if floored is not None:
+            candidates.append(trim(floored))
+        return min(candidates, key=lambda q: q @ cat.cost)
+
+
+# ===== 카탈로그 버전별 캐시 =====
+MAX_MODELS = 4
+_relaxed = OrderedDict()
+_relaxed_lock = threading.Lock()
+
+
+def get_relaxed(catalog):
+    with _relaxed_lock:
+        model = _relaxed.get(catalog.version)
+        if model is None:
+            model = RelaxedModel(catalog)
+            _relaxed[catalog.version] = model
+            while len(_relaxed) > MAX_MODELS:
+                _relaxed.popitem(last=False)
+        _relaxed.move_to_end(catalog.version)
+        return model
+
+
+@on_publish
+def _evict_relaxed(old, new):
+    if old is not None and old.version != new.version:
+        with _relaxed_lock:
+            _relaxed.pop(old.version, None)
+
+
+def approximate_menu(cal_target, protein_target, budget_limit, path=DATA_PATH):
+    """
+    근사 모드 (UI 슬라이더용, 정수 최적성 보장 없음)
+    - LP 완화 → 반올림/보정으로 정수 식단
+    - lp_bound: LP 하한, gap: (근사 비용 - 하한) / 하한
+    - shadow_prices: 칼로리 1kcal / 단백질 1g 증가 시 비용 증가분
+    """
+    catalog = get_catalog(path)
+    model = get_relaxed(catalog)
+    x_lp, lp_bound, (u, v) = model.solve_lp(cal_target, protein_target)
+    out = {"lp_bound": lp_bound, "shadow_prices": {"cal": u, "protein": v}}
+    if x_lp is None or lp_bound > budget_limit:
+        out["status"] = "infeasible"
+        return out
+
+    qty = model.round_plan(x_lp, cal_target, protein_target)
+    result, total_cost, total_cal, total_protein = summarize_plan(catalog, qty)
+    out.update(
+        status="approximate" if total_cost <= budget_limit else "over_budget",
+        result=result, total_cost=total_cost, total_cal=total_cal, total_protein=total_protein,
+        gap=(total_cost - lp_bound) / lp_bound if lp_bound > 0 else 0.0,
+    )
+    return out
@@ -0,0 +1,181 @@
+import os
+import time
+import numpy as np
+from pulp import LpProblem, LpMinimize, LpVariable, LpAffineExpression, PULP_CBC_CMD
+
+# scipy(HiGHS)는 선택 의존성: 없으면 CBC로 대체
+try:
+    from scipy.optimize import milp, LinearConstraint, Bounds
+    from scipy import sparse
+except ImportError:  # pragma: no cover
+    milp = None
+    sparse = None
+
+BACKENDS = ["highs", "cbc"]
+
+
+class SolveResult:
+    """
+    솔버 공통 결과
+    - x: 변수값 배열 (해가 없으면 None)
+    - status: "optimal" / "feasible"(시간 제한, 최적성 미증명) / "infeasible" / "unbounded" / "no_solution" / "error"
+    - gap: 증명된 상대 MIP gap (CBC는 하한을 알 수 없으므로 None), bound: 하한(dual bound)
+    - runtime: 풀이 시간(초)
+    """
+
+    def __init__(self, x, status, objective=None, backend=None, gap=None, bound=None, runtime=None):
+        self.x = x
+        self.status = status
+        self.objective = objective
+        self.backend = backend
+        self.gap = gap
+        self.bound = bound
+        self.runtime = runtime
+
+    @property
+    def feasible(self):
+        return self.x is not None
+
+    def __repr__(self):
+        return (f"SolveResult(status={self.status!r}, objective={self.objective!r}, "
+                f"gap={self.gap!r}, backend={self.backend!r})")
+
+    def info(self):
+        """JSON 응답용 요약 (x 제외)"""
+        return {"status": self.status, "objective": self.objective, "gap": self.gap,
+                "bound": self.bound, "backend": self.backend, "runtime": self.runtime}
+
+
+def highs_available():
+    return milp is not None
+
+
+def default_backend():
+    """MENU_SOLVER 환경변수 → 없으면 HiGHS, scipy가 없으면 CBC"""
+    name = os.environ.get("MENU_SOLVER")
+    if name:
+        return resolve_backend(name)
+    return "highs" if highs_available() else "cbc"
+
+
+def resolve_backend(name=None):
+    if name is None:
+        return default_backend()
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 솔버: {name} (가능: {', '.join(BACKENDS)})")
+    if name == "highs" and not highs_available():
+        return "cbc"
+    return name
+
+
+# ===== HiGHS (scipy.optimize.milp, 프로세스 내부) =====
+_HIGHS_STATUS = {0: "optimal", 2: "infeasible", 3: "unbounded"}
+
+
+def _highs_options(time_limit=None, mip_gap=None):
+    options = {}
+    if time_limit:
+        options["time_limit"] = float(time_limit)
+    if mip_gap is not None:
+        options["mip_rel_gap"] = float(mip_gap)
+    return options or None
+
+
+def solve_highs(c, A, lb, ub, integrality=None, x_upper=None, time_limit=None, mip_gap=None):
+    n = len(c)
+    if integrality is None:
+        integrality = np.ones(n)
+    bounds = Bounds(0, np.inf if x_upper is None else x_upper)
+    t0 = time.perf_counter()
+    res = milp(c, constraints=LinearConstraint(A, lb, ub), integrality=integrality, bounds=bounds,
+               options=_highs_options(time_limit, mip_gap))
+    runtime = time.perf_counter() - t0
+    status = _HIGHS_STATUS.get(res.status, "error")
+    if res.status == 1:
+        # 시간 제한 도달: 해가 있으면 최적성 미증명 해, 없으면 해 없음
+        status = "feasible" if res.x is not None else "no_solution"
+    if res.x is None:
+        return SolveResult(None, status, backend="highs", runtime=runtime)
+    gap = getattr(res, "mip_gap", None)
+    bound = getattr(res, "mip_dual_bound", None)
+    return SolveResult(res.x, status, objective=float(res.fun), backend="highs",
+                       gap=None if gap is None else float(gap),
+                       bound=None if bound is None else float(bound), runtime=runtime)
+
+
+# ===== CBC (PuLP, 외부 프로세스) =====
+# PuLP status(-1: 불가능, -2: 무계) 우선, 그다음 sol_status(1: 최적, 2: 시간 제한 내 정수해)
+_CBC_STATUS = {-1: "infeasible", -2: "unbounded"}
+_CBC_SOL_STATUS = {1: "optimal", 2: "feasible"}
+
+
+def _matrix_rows(A):
+    """행렬의 각 행을 (열 인덱스, 계수) 쌍으로 (희소/밀집 모두 지원)"""
+    if sparse is not None and sparse.issparse(A):
+        A = A.tocsr()
+        for r in range(A.shape[0]):
+            lo, hi = A.indptr[r], A.indptr[r + 1]
+            yield A.indices[lo:hi], A.data[lo:hi]
+    else:
+        A = np.atleast_2d(np.asarray(A, dtype=np.float64))
+        for row in A:
+            cols = np.flatnonzero(row)
+            yield cols, row[cols]
+
+
+def cbc_solver(time_limit=None, mip_gap=None, warm_start=False):
+    return PULP_CBC_CMD(msg=0, timeLimit=time_limit, gapRel=mip_gap, warmStart=warm_start)
+
+
+def solve_cbc(c, A, lb, ub, integrality=None, x_upper=None, time_limit=None, mip_gap=None, solver=None):
+    n = len(c)
+    x_upper = np.broadcast_to(np.inf if x_upper is None else x_upper, n)
+    integrality = np.broadcast_to(1 if integrality is None else integrality, n)
+    prob = LpProblem("MilitaryMealPlan", LpMinimize)
+    xs = [
+        LpVariable(f"x_{i}", lowBound=0,
+                   upBound=float(x_upper[i]) if np.isfinite(x_upper[i]) else None,
+                   cat="Integer" if integrality[i] else "Continuous")
+        for i in range(n)
+    ]
+
+    prob += LpAffineExpression(zip(xs, np.asarray(c, dtype=np.float64).tolist()))
+    for r, (cols, vals) in enumerate(_matrix_rows(A)):
+        expr = LpAffineExpression((xs[j], v) for j, v in zip(cols.tolist(), vals.tolist()))
+        if np.isfinite(lb[r]) and np.isfinite(ub[r]) and lb[r] == ub[r]:
+            prob += expr == float(lb[r]), f"c{r}"
+            continue
+        if np.isfinite(lb[r]):
+            prob += expr >= float(lb[r]), f"c{r}_lb"
+        if np.isfinite(ub[r]):
+            prob += expr <= float(ub[r]), f"c{r}_ub"
+
+    t0 = time.perf_counter()
+    prob.solve(solver or cbc_solver(time_limit, mip_gap))
+    return cbc_result(prob, xs, runtime=time.perf_counter() - t0)
+
+
+def cbc_result(prob, xs, runtime=None):
+    status = _CBC_STATUS.get(prob.status) or _CBC_SOL_STATUS.get(prob.sol_status, "no_solution")
+    if status not in ("optimal", "feasible"):
+        return SolveResult(None, status, backend="cbc", runtime=runtime)
+    x = np.array([v.varValue or 0 for v in xs])
+    # PuLP의 CBC 명령행 인터페이스는 하한을 돌려주지 않으므로 증명된 gap을 알 수 없음 (None)
+    return SolveResult(x, status, objective=float(prob.objective.value() or 0), backend="cbc",
+                       runtime=runtime)
+
+
+def solve_milp(c, A, lb, ub, backend=None, integrality=None, x_upper=None, time_limit=None, mip_gap=None):
+    """
+    min c·x  s.t.  lb <= A x <= ub,  0 <= x <= x_upper (기본: 정수)
+    backend: "highs"(기본) / "cbc"
+    time_limit: 초 단위 제한 (None이면 무제한), mip_gap: 상대 gap 허용치
+    """
+    backend = resolve_backend(backend)
+    lb = np.asarray(lb, dtype=np.float64)
+    ub = np.asarray(ub, dtype=np.float64)
+    if backend == "highs":
+        return solve_highs(c, A, lb, ub, integrality=integrality, x_upper=x_upper,
+                           time_limit=time_limit, mip_gap=mip_gap)
+    return solve_cbc(c, A, lb, ub, integrality=integrality, x_upper=x_upper,
+                     time_limit=time_limit, mip_gap=mip_gap)
@@ -0,0 +1,116 @@
+import math
+import csv
+import io
+import numpy as np
+from .catalog import get_catalog, DATA_PATH
+from .model import get_model
+from .relax import get_relaxed
+from .menu import summarize_plan
+
+# 예산 제한이 없을 때 CBC에 넘길 충분히 큰 우변 (PuLP는 inf 우변을 허용하지 않음)
+NO_BUDGET = 1e12
+
+CSV_FIELDS = ["cal", "protein", "budget", "status", "cost", "lp_bound",
+              "shadow_cal", "shadow_protein", "pareto", "warm_started"]
+
+
+def target_range(spec, max_points=None):
+    """
+    [값, ...] 또는 {"start", "stop", "step"} → 값 목록 (stop 포함)
+    - max_points: 값 개수 상한 (배열을 만들기 전에 개수를 계산해 확인, 넘으면 ValueError)
+    """
+    if isinstance(spec, dict):
+        start, stop = float(spec["start"]), float(spec["stop"])
+        if not (np.isfinite(start) and np.isfinite(stop)):
+            raise ValueError("start/stop은 유한한 값이어야 합니다.")
+        if stop < start:
+            raise ValueError("stop은 start 이상이어야 합니다.")
+        if stop == start:
+            return [start]
+        step = float(spec.get("step") or (stop - start) / max(int(spec.get("num", 10)) - 1, 1))
+        if not step > 0:
+            raise ValueError("step은 0보다 커야 합니다.")
+        count = math.floor((stop - start) / step + 0.5) + 1
+        if max_points is not None and count > max_points:
+            raise ValueError(f"값은 최대 {max_points}개까지 가능합니다 (요청: {count}개).")
+        return (start + step * np.arange(count)).tolist()
+    if isinstance(spec, (int, float)):
+        return [float(spec)]
+    values = [float(v) for v in spec]
+    if max_points is not None and len(values) > max_points:
+        raise ValueError(f"값은 최대 {max_points}개까지 가능합니다 (요청: {len(values)}개).")
+    return values
+
+
+def _serpentine(cal_values, protein_values):
+    """이웃한 격자점을 연달아 방문하는 순서 (이전 해를 초기해로 재사용하기 위함)"""
+    for a, cal in enumerate(cal_values):
+        proteins = protein_values if a % 2 == 0 else protein_values[::-1]
+        for protein in proteins:
+            yield cal, protein
+
+
+def sweep_targets(cal_values, protein_values, budget_limit=None, path=DATA_PATH, backend="cbc",
+                  time_limit=None, include_plans=False):
+    """
+    (칼로리 목표 × 단백질 목표) 격자 위의 최소 비용 곡선
+    - 카탈로그 버전별로 만든 모델을 재사용하고 우변만 바꿔서 풀이
+    - CBC는 직전(이웃) 격자점의 해를 초기해(warm start)로 사용
+    - 각 점에 LP 완화의 쌍대값(shadow price)을 함께 기록 → 작은 변화는 재풀이 없이 추정
+    """
+    catalog = get_catalog(path)
+    model = get_model(catalog)
+    relaxed = get_relaxed(catalog)
+    budget = NO_BUDGET if budget_limit is None else float(budget_limit)
+
+    rows, prev = [], None
+    for cal, protein in _serpentine(list(cal_values), list(protein_values)):
+        _, lp_bound, (u, v) = relaxed.solve_lp(cal, protein)
+        row = {"cal": cal, "protein": protein, "budget": budget_limit, "lp_bound": lp_bound,
+               "shadow_cal": u, "shadow_protein": v, "warm_started": prev is not None}
+
+        if lp_bound > budget:
+            # LP 완화도 예산을 넘으면 정수 문제도 불가능 → 솔버 호출 생략
+            row.update(status="infeasible", cost=None)
+        else:
+            res = model.solve(cal, protein, budget, backend=backend, time_limit=time_limit, warm_start=prev)
+            row.update(status=res.status, cost=None)
+            if res.feasible:
+                row["cost"] = float(np.rint(res.x) @ catalog.cost)
+                prev = res.x
+                if include_plans:
+                    row["result"] = summarize_plan(catalog, res.x)[0]
+        rows.append(row)
+
+    rows.sort(key=lambda r: (r["cal"], r["protein"]))
+    mark_pareto(rows)
+    return rows
+
+
+def mark_pareto(rows):
+    """
+    비용-목표 파레토 프런티어 표시
+    - 다른 점이 칼로리/단백질 목표가 모두 같거나 높으면서 비용이 같거나 낮으면 지배됨
+    """
+    feasible = [r for r in rows if r["cost"] is not None]
+    if not feasible:
+        return rows
+    cal = np.array([r["cal"] for r in feasible])
+    protein = np.array([r["protein"] for r in feasible])
+    cost = np.array([r["cost"] for r in feasible])
+    ge = (cal[None, :] >= cal[:, None]) & (protein[None, :] >= protein[:, None]) & (cost[None, :] <= cost[:, None])
+    strict = (cal[None, :] > cal[:, None]) | (protein[None, :] > protein[:, None]) | (cost[None, :] < cost[:, None])
+    dominated = (ge & strict).any(axis=1)
+    for r, d in zip(feasible, dominated):
+        r["pareto"] = not d
+    for r in rows:
+        r.setdefault("pareto", False)
+    return rows
+
+
+def to_csv(rows):
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=CSV_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue()
@@ -0,0 +1,151 @@
+"""
+작은 DAG 파이프라인 실행기
+- 단계(stage)마다 이름, 입력 이름, 출력 이름을 선언
+- 입력이 모두 준비된 단계부터 스레드 풀에서 병렬 실행 (max_workers로 상한)
+- 단계별 시작 시각/소요 시간 기록
+- checkpoint(checkpoint.Checkpoint)를 주면 끝난 단계 결과를 저장하고, 저장된 단계는 다시 실행하지 않음
+
+    p = Pipeline("paper", max_workers=8)
+    p.stage("title", make_title, inputs=["topic"])
+    p.stage("abstract", make_abstract, inputs=["title"])
+    run = p.run(topic="...")
+    run.values["abstract"], run.timings["abstract"]
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class StageError(RuntimeError):
+    """단계 실행 중 예외 (원래 예외는 __cause__)"""
+
+    def __init__(self, stage, error):
+        super().__init__(f"'{stage}' 단계 실패: {error}")
+        self.stage = stage
+
+
+class Stage:
+    def __init__(self, name, func, inputs=(), outputs=None, persist=True):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        # 출력이 여러 개면 func는 같은 길이의 튜플을 반환
+        self.outputs = tuple(outputs) if outputs else (name,)
+        # 체크포인트 저장 여부 (JSON으로 저장할 수 없거나 파일을 만드는 단계는 False)
+        self.persist = persist
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, inputs={self.inputs}, outputs={self.outputs})"
+
+
+class PipelineRun:
+    def __init__(self, values, timings, seconds):
+        self.values = values
+        self.timings = timings
+        self.seconds = seconds
+
+    def report(self):
+        # 시작 순서대로 (이름, 시작 시각, 소요 시간)
+        rows = sorted(self.timings.items(), key=lambda kv: kv[1]["start"])
+        return [{"stage": name, **t} for name, t in rows]
+
+
+class Pipeline:
+    def __init__(self, name="pipeline", max_workers=4):
+        self.name = name
+        self.max_workers = max_workers
+        self.stages = {}
+        self._producers = {}
+
+    def stage(self, name, func, inputs=(), outputs=None, persist=True):
+        if name in self.stages:
+            raise ValueError(f"이미 있는 단계입니다: {name}")
+        stage = Stage(name, func, inputs, outputs, persist)
+        for out in stage.outputs:
+            if out in self._producers:
+                raise ValueError(f"'{out}' 출력이 '{self._producers[out]}' 단계와 중복됩니다.")
+        for out in stage.outputs:
+            self._producers[out] = name
+        self.stages[name] = stage
+        return self
+
+    def validate(self, provided=()):
+        # 입력 누락과 순환 의존 확인 → 실행 순서(위상 정렬) 반환
+        provided = set(provided)
+        for stage in self.stages.values():
+            missing = [i for i in stage.inputs if i not in self._producers and i not in provided]
+            if missing:
+                raise ValueError(f"'{stage.name}' 단계의 입력이 없습니다: {', '.join(missing)}")
+        deps = {s.name: {self._producers[i] for i in s.inputs if i in self._producers} for s in self.stages.values()}
+        order, done = [], set()
+        while len(order) < len(deps):
+            ready = [n for n, d in deps.items() if n not in done and d <= done]
+            if not ready:
+                cycle = sorted(n for n in deps if n not in done)
+                raise ValueError(f"순환 의존이 있습니다: {', '.join(cycle)}")
+            order.extend(ready)
+            done.update(ready)
+        return order
+
+    def run(self, checkpoint=None, **inputs):
+        """
+        모든 단계를 실행하고 PipelineRun 반환
+        - 단계가 실패하면 아직 시작하지 않은 단계는 취소하고 StageError 발생
+        - checkpoint에 저장된 단계는 결과만 불러옴 → 실패 후 같은 checkpoint로 다시 실행하면
+          첫 번째 누락 단계부터 재개
+        """
+        self.validate(inputs)
+        values = dict(inputs)
+        timings = {}
+        pending = dict(self.stages)
+        running = {}
+        t0 = time.perf_counter()
+
+        def execute(stage, args):
+            start = time.perf_counter()
+            result = stage.func(*args)
+            if checkpoint is not None and stage.persist:
+                checkpoint.save(stage.name, result)
+            return result, start - t0, time.perf_counter() - start
+
+        def store(stage, result):
+            if len(stage.outputs) == 1:
+                values[stage.outputs[0]] = result
+            else:
+                values.update(zip(stage.outputs, result))
+
+        def restore(stage):
+            if checkpoint is None or not stage.persist or not checkpoint.has(stage.name):
+                return False
+            store(stage, checkpoint.load(stage.name))
+            timings[stage.name] = {"start": round(time.perf_counter() - t0, 3), "seconds": 0.0, "cached": True}
+            return True
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                ready = True
+                while ready:
+                    ready = False
+                    for name, stage in list(pending.items()):
+                        if all(i in values for i in stage.inputs):
+                            del pending[name]
+                            if restore(stage):
+                                # 불러온 결과로 다른 단계가 준비될 수 있으므로 다시 확인
+                                ready = True
+                                continue
+                            args = [values[i] for i in stage.inputs]
+                            running[executor.submit(execute, stage, args)] = stage
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    try:
+                        result, start, seconds = future.result()
+                    except Exception as e:
+                        for other in running:
+                            other.cancel()
+                        raise StageError(stage.name, e) from e
+                    timings[stage.name] = {"start": round(start, 3), "seconds": round(seconds, 3)}
+                    store(stage, result)
+
+        return PipelineRun(values, timings, round(time.perf_counter() - t0, 3))
@@ -0,0 +1,24 @@
+from collections import Counter
+from optimizer.catalog import MenuCatalog
+from optimizer import plan_week
+
+
+def small_catalog():
+    # A가 가장 싸고 B, C, D 순으로 비쌈 (영양은 모두 같음)
+    return MenuCatalog(["A", "B", "C", "D"], [1.0, 2.0, 3.0, 4.0], [100.0] * 4, [10.0] * 4, version="test")
+
+
+def test_plain_plan_repeats_best_day():
+    result = plan_week(100, 10, days=5, catalog=small_catalog())
+    assert result["status"] == "optimal" and not result["heuristic"]
+    assert result["total_cost"] == 5.0
+    assert result["distinct_dishes"] == 1
+
+
+def test_max_repeats_groups_days():
+    # A, B는 2일씩만 → 5일이면 C가 하루 필요 (최적 비용 2*1 + 2*2 + 3 = 9)
+    result = plan_week(100, 10, days=5, max_repeats=2, catalog=small_catalog(), candidate_layers=None)
+    assert result["status"] == "feasible" and result["heuristic"]
+    used = Counter(row["menu"] for day in result["days"] for row in day["result"])
+    assert max(used.values()) <= 2
+    assert result["total_cost"] == 9.0
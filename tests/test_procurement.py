@@ -0,0 +1,34 @@
+from optimizer.catalog import MenuCatalog
+from optimizer import plan_procurement
+
+TIERS = [(0, 1.0), (1000, 0.9), (5000, 0.8)]
+
+
+def small_catalog():
+    # A: 싼 메뉴, B: 영양은 같고 10배 비싼 메뉴
+    return MenuCatalog(["A", "B"], [1.0, 10.0], [100.0, 100.0], [10.0, 10.0], version="test")
+
+
+def test_supply_cap_inside_middle_tier():
+    # 상한 1200은 두 번째 구간(1000~5000) 안 → 구간별 상한만으로는 1400까지 주문됨
+    units = [{"name": "u1", "headcount": 700, "cal": 100, "protein": 10},
+             {"name": "u2", "headcount": 700, "cal": 100, "protein": 10}]
+    result = plan_procurement(units, supply_caps={"A": 1200}, tiers=TIERS, catalog=small_catalog(),
+                              candidate_layers=None)
+    assert result["status"] == "optimal"
+    order = {row["menu"]: row["quantity"] for row in result["order"]}
+    assert order.get("A", 0) <= 1200
+    assert order == {"A": 700, "B": 700}
+
+
+def test_pruned_candidates_are_not_reported_optimal():
+    # C는 A, X에 지배되는 메뉴 → 1층만 남기면 빠짐. A 상한 때문에 실제 최적해에는 C가 필요
+    catalog = MenuCatalog(["A", "X", "C"], [1.0, 1.0, 1.5], [100.0, 50.0, 100.0], [10.0, 20.0, 10.0],
+                          version="test")
+    units = [{"name": "u1", "headcount": 700, "cal": 100, "protein": 10},
+             {"name": "u2", "headcount": 700, "cal": 100, "protein": 10}]
+    exact = plan_procurement(units, supply_caps={"A": 1200}, tiers=TIERS, catalog=catalog)
+    pruned = plan_procurement(units, supply_caps={"A": 1200}, tiers=TIERS, catalog=catalog, candidate_layers=1)
+    assert exact["status"] == "optimal" and not exact["heuristic"]
+    assert pruned["status"] == "feasible" and pruned["heuristic"]
+    assert pruned["total_cost"] > exact["total_cost"]
@@ -1,30 +1,23 @@
 import os
+import sys
 from pylatex import Document, Command, NoEscape
-import openai
 import json
-
-openai.api_key = None  # Flask에서 받은 API 키로 runtime에 세팅
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import llm_client
 
 # ChatGPT 요청 함수
-def ask_question(question):
-    response = openai.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "당신은 한국어 학술 논문 작성 전문가입니다."},
-            {"role": "user", "content": question}
-        ],
-        temperature=0.7,
-        max_completion_tokens=2048,
-    )
-    return response.choices[0].message.content.strip()
+def ask_question(question, api_key=None):
+    # api_key: Flask에서 받은 API 키 (요청마다 전달)
+    return llm_client.ask(question, system="당신은 한국어 학술 논문 작성 전문가입니다.", api_key=api_key,
+                          max_tokens=2048)
 
 # 논문 각 섹션 작성 함수
-def write_section(title, topic):
+def write_section(title, topic, api_key=None):
     question = f"'{topic}' 주제에 대해 '{title}' 섹션을 작성하세요. 전문적이고 학술적인 한국어 문체로 작성하세요. 분량은 최소 300단어 이상으로 해주세요."
-    return ask_question(question)
+    return ask_question(question, api_key)
 
 # 메인 논문 생성 함수
-def generate_paper(title, topic, num_list=3, structure="intro-method-results-discussion", references=10):
+def generate_paper(title, topic, num_list=3, structure="intro-method-results-discussion", references=10, api_key=None):
     # 논문 구조 정의
     structures = {
         "intro-method-results-discussion": ["서론", "연구 방법", "연구 결과", "논의"],
@@ -50,7 +43,7 @@ def generate_paper(title, topic, num_list=3, structure="intro-method-results-dis
     # 섹션 작성
     for sec in section_list:
         document.append(NoEscape(f"\\section{{{sec}}}"))
-        content = write_section(sec, topic)
+        content = write_section(sec, topic, api_key)
         document.append(NoEscape(content))
         document.append(Command('newpage'))
 
@@ -58,7 +51,7 @@ def generate_paper(title, topic, num_list=3, structure="intro-method-results-dis
     document.append(NoEscape(r"\begin{thebibliography}{99}"))
     for i in range(1, references+1):
         ref_question = f"'{topic}'와 관련된 학술 참고문헌 1개를 APA 형식으로 제시하세요."
-        ref_text = ask_question(ref_question)
+        ref_text = ask_question(ref_question, api_key)
         document.append(NoEscape(f"\\bibitem{{ref{i}}} {ref_text}"))
     document.append(NoEscape(r"\end{thebibliography}"))
 
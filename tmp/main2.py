@@ -1,27 +1,15 @@
-import os, io, requests, contextlib, re, random, zipfile
+import os, io, sys, requests, contextlib, re, random, zipfile
 from pylatex import Document, Command, NoEscape
 import matplotlib.pyplot as plt
-import openai
-
-openai.api_key = None  # Flask 또는 환경변수에서 세팅
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import llm_client
 
 # ---------------------------
 # ChatGPT 요청 함수
 # ---------------------------
 def ask_question(question, language="ko", api_key=None):
-    if api_key:
-        openai.api_key = api_key
     system_prompt = "당신은 SCI/KCI 수준 학술 논문 작성 전문가입니다." if language=="ko" else "You are an expert in academic paper writing."
-    response = openai.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": question}
-        ],
-        temperature=0.7,
-        max_completion_tokens=3000
-    )
-    return response.choices[0].message.content.strip()
+    return llm_client.ask(question, system=system_prompt, api_key=api_key, max_tokens=3000)
 
 # ---------------------------
 # 텍스트 클린업
@@ -59,7 +47,6 @@ def safe_filename(section_title, suffix):
 # DALL·E 이미지 생성
 # ---------------------------
 def generate_images(api_key, topic, section_title, count=1):
-    openai.api_key = api_key
     os.makedirs("images", exist_ok=True)
     image_files = []
     for i in range(count):
@@ -70,12 +57,7 @@ def generate_images(api_key, topic, section_title, count=1):
             "깔끔하고 전문적인 스타일, 발표/논문용 그림 느낌. 흑백그림, 스케치 등"
         )
         for attempt in range(3):
-            response = openai.images.generate(
-                model="dall-e-3",
-                prompt=prompt,
-                size="1024x1024"
-            )
-            image_url = response.data[0].url if response.data and response.data[0].url else None
+            image_url = llm_client.generate_image(prompt, api_key=api_key)
             if image_url:
                 break
         if not image_url:
@@ -92,7 +74,6 @@ def generate_images(api_key, topic, section_title, count=1):
 # Matplotlib 그래프 생성
 # ---------------------------
 def generate_graph(section_title, topic, figure_number=1, language="ko", api_key=None):
-    openai.api_key = api_key
     os.makedirs("graphs", exist_ok=True)
     fig_path = os.path.join("graphs", safe_filename(section_title, f"fig{figure_number}"))
     question = (
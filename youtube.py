@@ -1,27 +1,28 @@
+import os
 import requests
 from gtts import gTTS
 import subprocess
-from openai import OpenAI
+import llm_client
+import checkpoint
 import imageio_ffmpeg as ffmpeg
 from mutagen.mp3 import MP3
 
 # 1️⃣ 스크립트 생성
 def generate_script(api_key, topic):
-    client = OpenAI(api_key=api_key)    
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": f"'{topic}'에 대해 한국어로 1분 길이의 흥미로운 스크립트를 작성하세요."}
-        ],
-        max_completion_tokens=250
+    return llm_client.ask(
+        f"'{topic}'에 대해 한국어로 1분 길이의 흥미로운 스크립트를 작성하세요.",
+        system="You are a helpful assistant.",
+        api_key=api_key,
+        temperature=1.0,
+        max_tokens=250,
     )
-    return response.choices[0].message.content.strip()
 
 # 2️⃣ 텍스트 → MP3 변환
 def script_to_mp3(script, filename="output.mp3"):
+    # 임시 파일에 저장 후 교체 (중단돼도 불완전한 파일이 남지 않도록)
     tts = gTTS(text=script, lang='ko')
-    tts.save(filename)
+    tts.save(filename + ".part")
+    os.replace(filename + ".part", filename)
     return filename
 
 # 3️⃣ MP3 → WAV 변환 (CBR로 고정)
@@ -40,28 +41,27 @@ def get_audio_duration(filename):
     return audio.info.length
 
 # 5️⃣ 이미지 생성
-def generate_images(api_key, topic, count=5):
-    client = OpenAI(api_key=api_key)
+def generate_images(api_key, topic, count=5, out_dir="."):
+    # 이미 있는 이미지는 다시 생성하지 않음 (재개 시 남은 이미지만 생성)
     image_files = []
 
     for i in range(count): 
+        filename = os.path.join(out_dir, f"image_{i+1}.png")
+        if os.path.exists(filename):
+            image_files.append(filename)
+            continue
         prompt = (
             f"{topic}에 관한 스크립트 내용을 요약 및 시각적으로 표현한 장면, "
             f"직접적인 인물 이름이나 브랜드 대신 묘사적/추상적 스타일 사용, "
             f"variation {i+1}"
         )
-        response = client.images.generate(
-            model="dall-e-3",
-            prompt=prompt,
-            size="1024x1024"
-        )
-        image_url = response.data[0].url if response.data and response.data[0].url else None
+        image_url = llm_client.generate_image(prompt, api_key=api_key)
         if not image_url:
             raise ValueError("❌ 이미지 URL을 생성하지 못했습니다.")
         img_data = requests.get(image_url).content
-        filename = f"image_{i+1}.png"
-        with open(filename, 'wb') as f:
+        with open(filename + ".part", 'wb') as f:
             f.write(img_data)
+        os.replace(filename + ".part", filename)
         image_files.append(filename)
 
     return image_files
@@ -70,8 +70,10 @@ def generate_images(api_key, topic, count=5):
 def create_video(images, audio_file, output_file="output.mp4"):
     ffmpeg_path = ffmpeg.get_ffmpeg_exe()
 
+    work_dir = os.path.dirname(output_file) or "."
+
     # 오디오를 WAV로 변환
-    fixed_audio = convert_audio_to_wav(audio_file)
+    fixed_audio = convert_audio_to_wav(audio_file, os.path.join(work_dir, "output.wav"))
 
     # 오디오 길이 확인
     audio_length = get_audio_duration(audio_file)
@@ -79,17 +81,18 @@ def create_video(images, audio_file, output_file="output.mp4"):
     duration_per_image = audio_length / num_images
 
     # 이미지 목록 파일 생성
-    with open("images.txt", "w", encoding="utf-8") as f:
+    list_file = os.path.join(work_dir, "images.txt")
+    with open(list_file, "w", encoding="utf-8") as f:
         for img in images[:-1]:
-            f.write(f"file '{img}'\n")
+            f.write(f"file '{os.path.abspath(img)}'\n")
             f.write(f"duration {duration_per_image}\n")
         # 마지막 이미지는 duration 없이 반복 → ffmpeg가 자연스럽게 오디오 끝까지 유지
-        f.write(f"file '{images[-1]}'\n")
+        f.write(f"file '{os.path.abspath(images[-1])}'\n")
 
     # ffmpeg 실행
     subprocess.run([
         ffmpeg_path, "-y", "-f", "concat", "-safe", "0",
-        "-i", "images.txt", "-i", fixed_audio,
+        "-i", list_file, "-i", fixed_audio,
         "-c:v", "libx264", "-c:a", "aac", "-b:a", "192k",
         output_file
     ], check=True)
@@ -97,10 +100,31 @@ def create_video(images, audio_file, output_file="output.mp4"):
     return output_file
 
 
+# 요청마다 별도 작업 폴더 사용 (동시 요청끼리 파일이 섞이지 않도록)
+# 작업 폴더 = 체크포인트 폴더 (shorts/<run_id>/)
+SHORTS_DIR = "shorts"
+
 # 7️⃣ 최종 함수
-def create_youtube_short(api_key, topic, num_images=5):
-    script = generate_script(api_key, topic)
-    audio_file = script_to_mp3(script, "output.mp3")
-    images = generate_images(api_key, topic, count=num_images)
-    video_file = create_video(images, audio_file, "output.mp4")
+def create_youtube_short(api_key, topic, num_images=5, run_id=None):
+    """
+    같은 run_id로 다시 호출하면 이미 만든 스크립트/음성/이미지는 그대로 사용하고
+    남은 단계부터 진행 (영상 합성은 매번 다시 실행)
+    영상도 작업 폴더 안에 있으므로 전달 후 discard_short(run_id)로 삭제
+    """
+    ckpt = checkpoint.open_run("short", run_id, root=SHORTS_DIR, topic=topic, num_images=num_images)
+    work_dir = ckpt.dir
+    script = checkpoint.cached(ckpt, "script", generate_script, api_key, topic)
+    audio_file = os.path.join(work_dir, "output.mp3")
+    if not os.path.exists(audio_file):
+        script_to_mp3(script, audio_file)
+    images = generate_images(api_key, topic, count=num_images, out_dir=work_dir)
+    video_file = create_video(images, audio_file, os.path.join(work_dir, "output.mp4"))
     return video_file
+
+def discard_short(run_id):
+    checkpoint.Checkpoint(run_id, root=SHORTS_DIR).remove()
+
+def resume_youtube_short(run_id, api_key):
+    # 저장된 입력값(meta.json)으로 중단된 쇼츠 생성 재개
+    meta = checkpoint.Checkpoint.open(run_id, root=SHORTS_DIR).meta
+    return create_youtube_short(api_key, meta["topic"], meta["num_images"], run_id)